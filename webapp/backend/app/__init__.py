@@ -1,3 +1,13 @@
-from .main import app, create_app
+from typing import Any
+
+from .main import create_app
 
 __all__ = ["app", "create_app"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "app":
+        from .main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
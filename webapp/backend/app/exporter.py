@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import base64
+from collections import OrderedDict
+from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 import io
 import json
 import os
@@ -11,6 +14,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import zipfile
 from html import escape
@@ -20,24 +24,28 @@ from uuid import uuid4
 
 from docx import Document
 from docx.enum.section import WD_ORIENT
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
+from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import nsdecls, qn
 from docx.shared import Inches, Mm, Pt, RGBColor
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+from lxml import etree
 
 from .models import FormattingOptions, GenerateSecurityPayload, ThemePayload
 from .parser import Node, render_preview_html, to_markdown, to_plain_text
 from .security import (
-    disable_docx_editing,
+    clear_docx_metadata,
     mask_sensitive_url,
-    remove_docx_metadata,
+    protect_docx_editing,
     secure_pdf,
     validate_remote_media_url,
 )
 from .themes import css_from_theme
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportResult:
     file_id: str
     output_path: Path
@@ -49,7 +57,7 @@ class ExportResult:
     warning: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CaptionTracker:
     chapter_idx: int = 0
     figure_global: int = 0
@@ -120,6 +128,7 @@ def _docx2pdf_supported() -> bool:
     return sys.platform in {"win32", "darwin"}
 
 
+@lru_cache(maxsize=256)
 def _hex_to_rgb(value: str) -> RGBColor:
     cleaned = value.strip().lstrip("#")
     if len(cleaned) != 6:
@@ -130,6 +139,22 @@ def _hex_to_rgb(value: str) -> RGBColor:
         return RGBColor(31, 58, 95)
 
 
+@lru_cache(maxsize=256)
+def _hex_digits(value: str | None, default: str) -> str:
+    cleaned = (value or "").strip().lstrip("#")
+    return cleaned if len(cleaned) == 6 else default
+
+
+@lru_cache(maxsize=128)
+def _pt(value: float) -> Pt:
+    return Pt(value)
+
+
+@lru_cache(maxsize=64)
+def _inches(value: float) -> Inches:
+    return Inches(value)
+
+
 def _mm_or_default(value: float, default: float) -> Mm:
     return Mm(value if value >= 0 else default)
 
@@ -138,14 +163,18 @@ def _font_primary(font_family: str) -> str:
     return (font_family.split(",")[0] if font_family else "Calibri").strip()
 
 
+_BOLD_WEIGHTS = frozenset({"600", "700", "800", "900"})
+
+
+_DOCX_ALIGNMENTS = {
+    "center": WD_ALIGN_PARAGRAPH.CENTER,
+    "right": WD_ALIGN_PARAGRAPH.RIGHT,
+    "justify": WD_ALIGN_PARAGRAPH.JUSTIFY,
+}
+
+
 def _docx_alignment(value: str) -> WD_ALIGN_PARAGRAPH:
-    if value == "center":
-        return WD_ALIGN_PARAGRAPH.CENTER
-    if value == "right":
-        return WD_ALIGN_PARAGRAPH.RIGHT
-    if value == "justify":
-        return WD_ALIGN_PARAGRAPH.JUSTIFY
-    return WD_ALIGN_PARAGRAPH.LEFT
+    return _DOCX_ALIGNMENTS.get(value, WD_ALIGN_PARAGRAPH.LEFT)
 
 
 def _style_num(styles: dict[str, object], *keys: str, default: float) -> float:
@@ -275,36 +304,64 @@ def _numbered_labels(levels: Sequence[int], count: int) -> list[str]:
     return labels
 
 
-def _append_toc_field(paragraph) -> None:
-    run_begin = paragraph.add_run()
-    fld_begin = OxmlElement("w:fldChar")
-    fld_begin.set(qn("w:fldCharType"), "begin")
-    run_begin._r.append(fld_begin)
+_W_FLD_CHAR_TYPE = qn("w:fldCharType")
+_XML_SPACE = qn("xml:space")
+_W_VAL = qn("w:val")
+_W_SZ = qn("w:sz")
+_W_SPACE = qn("w:space")
+_W_COLOR = qn("w:color")
+_W_FILL = qn("w:fill")
+_W_SHD = qn("w:shd")
+_W_PBDR = qn("w:pBdr")
+_BORDER_EDGES = tuple((side, qn(f"w:{side}")) for side in ("top", "left", "bottom", "right"))
+
 
-    run_instr = paragraph.add_run()
+def _fld_char_run(char_type: str):
+    run = OxmlElement("w:r")
+    fld_char = OxmlElement("w:fldChar")
+    fld_char.set(_W_FLD_CHAR_TYPE, char_type)
+    run.append(fld_char)
+    return run
+
+
+@lru_cache(maxsize=32)
+def _field_run_templates(instruction: str, placeholder: str) -> tuple:
+    instr_run = OxmlElement("w:r")
     instr = OxmlElement("w:instrText")
-    instr.set(qn("xml:space"), "preserve")
-    instr.text = r'TOC \o "1-3" \h \z \u'
-    run_instr._r.append(instr)
+    instr.set(_XML_SPACE, "preserve")
+    instr.text = instruction
+    instr_run.append(instr)
+    placeholder_run = Run(OxmlElement("w:r"), None)
+    placeholder_run.text = placeholder
+    return (
+        _fld_char_run("begin"),
+        instr_run,
+        _fld_char_run("separate"),
+        placeholder_run._r,
+        _fld_char_run("end"),
+    )
+
 
-    run_sep = paragraph.add_run()
-    fld_sep = OxmlElement("w:fldChar")
-    fld_sep.set(qn("w:fldCharType"), "separate")
-    run_sep._r.append(fld_sep)
-    paragraph.add_run("Update this field in Word to generate the TOC.")
+def _append_field_runs(paragraph, instruction: str, placeholder: str) -> None:
+    p = paragraph._p
+    for template in _field_run_templates(instruction, placeholder):
+        p.append(deepcopy(template))
 
-    run_end = paragraph.add_run()
-    fld_end = OxmlElement("w:fldChar")
-    fld_end.set(qn("w:fldCharType"), "end")
-    run_end._r.append(fld_end)
+
+def _append_toc_field(paragraph) -> None:
+    _append_field_runs(paragraph, r'TOC \o "1-3" \h \z \u', "Update this field in Word to generate the TOC.")
+
+
+# Header only: the payload goes straight to b64decode instead of through a capture group.
+_DATA_URI_IMAGE_RE = re.compile(r"data:image/[a-zA-Z0-9.+-]+;base64,", re.IGNORECASE)
 
 
 def _decode_data_uri_image(source: str) -> bytes | None:
-    match = re.match(r"^data:image/[a-zA-Z0-9.+-]+;base64,(.+)$", source, flags=re.IGNORECASE | re.DOTALL)
-    if not match:
+    match = _DATA_URI_IMAGE_RE.match(source)
+    if not match or match.end() == len(source):
         return None
     try:
-        return base64.b64decode(match.group(1), validate=False)
+        return base64.b64decode(source[match.end():], validate=False)
     except Exception:
         return None
 
@@ -385,41 +442,29 @@ def _resolve_image_stream(source: str, warnings: List[str]) -> io.BytesIO | None
     return None
 
 
+_FIELD_NUMBER_SUFFIXES = {
+    "arabic": "",
+    "roman": r" \* ROMAN",
+    "roman_lower": r" \* roman",
+    "alpha": r" \* ALPHABETIC",
+    "alpha_lower": r" \* alphabetic",
+}
+
+
 def _field_instruction(field_name: str, number_style: str) -> str:
     style = (number_style or "arabic").strip().lower()
-    suffix_map = {
-        "arabic": "",
-        "roman": r" \* ROMAN",
-        "roman_lower": r" \* roman",
-        "alpha": r" \* ALPHABETIC",
-        "alpha_lower": r" \* alphabetic",
-    }
-    return f"{field_name}{suffix_map.get(style, '')}"
+    return f"{field_name}{_FIELD_NUMBER_SUFFIXES.get(style, '')}"
 
 
 def _append_field(paragraph, field_name: str, number_style: str) -> None:
-    run_begin = paragraph.add_run()
-    fld_begin = OxmlElement("w:fldChar")
-    fld_begin.set(qn("w:fldCharType"), "begin")
-    run_begin._r.append(fld_begin)
-
-    run_instr = paragraph.add_run()
-    instr = OxmlElement("w:instrText")
-    instr.set(qn("xml:space"), "preserve")
-    instr.text = _field_instruction(field_name, number_style)
-    run_instr._r.append(instr)
+    _append_field_runs(paragraph, _field_instruction(field_name, number_style), "1")
 
-    run_sep = paragraph.add_run()
-    fld_sep = OxmlElement("w:fldChar")
-    fld_sep.set(qn("w:fldCharType"), "separate")
-    run_sep._r.append(fld_sep)
 
-    paragraph.add_run("1")
-
-    run_end = paragraph.add_run()
-    fld_end = OxmlElement("w:fldChar")
-    fld_end.set(qn("w:fldCharType"), "end")
-    run_end._r.append(fld_end)
+_PAGE_PLACEHOLDER_RE = re.compile(r"\{page\}", re.IGNORECASE)
+_TOTAL_PLACEHOLDER_RE = re.compile(r"\{(?:pages|total)\}", re.IGNORECASE)
+_PAGE_TOKEN_RE = re.compile(r"(?P<page>X)|(?P<total>Y)", re.IGNORECASE)
+_PAGE_X_RE = re.compile(r"X", re.IGNORECASE)
+_PAGE_Y_RE = re.compile(r"Y", re.IGNORECASE)
 
 
 def _normalize_page_template(mode: str, template: str) -> str:
@@ -428,10 +473,9 @@ def _normalize_page_template(mode: str, template: str) -> str:
         return "Page X of Y" if mode == "page_x_of_y" else "Page X"
     lowered = raw.lower()
     if "{page}" in lowered:
-        raw = re.sub(r"\{page\}", "X", raw, flags=re.IGNORECASE)
+        raw = _PAGE_PLACEHOLDER_RE.sub("X", raw)
     if "{pages}" in lowered or "{total}" in lowered:
-        raw = re.sub(r"\{pages\}", "Y", raw, flags=re.IGNORECASE)
-        raw = re.sub(r"\{total\}", "Y", raw, flags=re.IGNORECASE)
+        raw = _TOTAL_PLACEHOLDER_RE.sub("Y", raw)
     if "x" not in raw.lower() and "y" not in raw.lower():
         return f"{raw} X"
     if mode == "page_x_of_y" and "y" not in raw.lower():
@@ -449,58 +493,67 @@ def _add_page_number(
     format_template: str = "",
 ) -> None:
     template = _normalize_page_template(mode, format_template)
-    parts = re.split(r"(X|Y)", template, flags=re.IGNORECASE)
-    for part in parts:
-        if not part:
-            continue
-        token = part.upper()
-        if token == "X":
-            _append_field(paragraph, "PAGE", number_style)
-        elif token == "Y":
-            _append_field(paragraph, "NUMPAGES", number_style)
-        else:
-            paragraph.add_run(part)
+    pos = 0
+    for match in _PAGE_TOKEN_RE.finditer(template):
+        if match.start() > pos:
+            paragraph.add_run(template[pos:match.start()])
+        _append_field(paragraph, "PAGE" if match.lastgroup == "page" else "NUMPAGES", number_style)
+        pos = match.end()
+    if pos < len(template):
+        paragraph.add_run(template[pos:])
+
+
+_DOCX_BORDER_STYLES = {
+    "single": "single",
+    "double": "double",
+    "dashed": "dashed",
+    "dotted": "dotted",
+    "thick": "thick",
+    "triple": "triple",
+    "inset": "inset",
+    "outset": "outset",
+    "wave": "wave",
+    "double_wave": "doubleWave",
+    "dash_dot": "dotDash",
+    "dash_dot_dot": "dotDotDash",
+}
 
 
 def _docx_border_style(raw: str) -> str:
     value = (raw or "").strip().lower()
-    mapping = {
-        "single": "single",
-        "double": "double",
-        "dashed": "dashed",
-        "dotted": "dotted",
-        "thick": "thick",
-        "triple": "triple",
-        "inset": "inset",
-        "outset": "outset",
-        "wave": "wave",
-        "double_wave": "doubleWave",
-        "dash_dot": "dotDash",
-        "dash_dot_dot": "dotDotDash",
-    }
-    return mapping.get(value, "single")
+    return _DOCX_BORDER_STYLES.get(value, "single")
+
+
+@lru_cache(maxsize=32)
+def _paragraph_border_template(side: str, border_style: str, sz: int, color_hex: str):
+    p_bdr = OxmlElement("w:pBdr")
+    edge = OxmlElement(f"w:{side}")
+    edge.set(_W_VAL, border_style)
+    edge.set(_W_SZ, str(sz))
+    edge.set(_W_SPACE, "1")
+    edge.set(_W_COLOR, color_hex)
+    p_bdr.append(edge)
+    return p_bdr
 
 
 def _apply_paragraph_separator(paragraph, side: str, color: str, width_pt: float, style: str) -> None:
+    color_hex = _hex_digits(color, "BFBFBF")
+    sz = max(2, min(96, int(round(max(0.25, width_pt) * 8))))
+    border_style = _docx_border_style(style)
     p_pr = paragraph._p.get_or_add_pPr()
-    p_bdr = p_pr.find(qn("w:pBdr"))
+    p_bdr = p_pr.find(_W_PBDR)
     if p_bdr is None:
-        p_bdr = OxmlElement("w:pBdr")
-        p_pr.append(p_bdr)
+        p_pr.append(deepcopy(_paragraph_border_template(side, border_style, sz, color_hex)))
+        return
 
     edge = p_bdr.find(qn(f"w:{side}"))
     if edge is None:
         edge = OxmlElement(f"w:{side}")
         p_bdr.append(edge)
-
-    color_hex = (color or "").strip().lstrip("#")
-    if len(color_hex) != 6:
-        color_hex = "BFBFBF"
-    sz = max(2, min(96, int(round(max(0.25, width_pt) * 8))))
-    edge.set(qn("w:val"), _docx_border_style(style))
-    edge.set(qn("w:sz"), str(sz))
-    edge.set(qn("w:space"), "1")
-    edge.set(qn("w:color"), color_hex)
+    edge.set(_W_VAL, border_style)
+    edge.set(_W_SZ, str(sz))
+    edge.set(_W_SPACE, "1")
+    edge.set(_W_COLOR, color_hex)
 
 
 def _apply_page_borders(
@@ -526,73 +579,156 @@ def _apply_page_borders(
     pg_borders.set(qn("w:offsetFrom"), "page")
     pg_borders.set(qn("w:shadow"), "true" if shadow else "false")
     pg_borders.set(qn("w:frame"), "true" if frame else "false")
-    color_hex = (color or "").strip().lstrip("#")
-    if len(color_hex) != 6:
-        color_hex = "000000"
+    color_hex = _hex_digits(color, "000000")
     sz = max(2, min(96, int(round(max(0.25, width_pt) * 8))))
     spacing = max(0, min(96, int(round(max(0.0, offset_pt)))))
     border_style = _docx_border_style(style)
 
-    for side in ("top", "left", "bottom", "right"):
-        edge = pg_borders.find(qn(f"w:{side}"))
+    sz_value = str(sz)
+    spacing_value = str(spacing)
+    for side, edge_tag in _BORDER_EDGES:
+        edge = pg_borders.find(edge_tag)
         if edge is None:
             edge = OxmlElement(f"w:{side}")
             pg_borders.append(edge)
-        edge.set(qn("w:val"), border_style)
-        edge.set(qn("w:sz"), str(sz))
-        edge.set(qn("w:space"), str(spacing))
-        edge.set(qn("w:color"), color_hex)
-
-
-def _set_cell_borders(cell, *, color: str, width_pt: float, style: str) -> None:
-    tc_pr = cell._tc.get_or_add_tcPr()
-    tc_borders = tc_pr.find(qn("w:tcBorders"))
-    if tc_borders is None:
-        tc_borders = OxmlElement("w:tcBorders")
-        tc_pr.append(tc_borders)
-
-    color_hex = (color or "").strip().lstrip("#")
-    if len(color_hex) != 6:
-        color_hex = "D1D5DB"
+        edge.set(_W_VAL, border_style)
+        edge.set(_W_SZ, sz_value)
+        edge.set(_W_SPACE, spacing_value)
+        edge.set(_W_COLOR, color_hex)
+
+
+def _cell_borders_xml(*, color: str, width_pt: float, style: str) -> str:
+    color_hex = _hex_digits(color, "D1D5DB")
     sz = max(2, min(96, int(round(max(0.25, width_pt) * 8))))
-    border_style = _docx_border_style(style)
-    for side in ("top", "left", "bottom", "right"):
-        edge = tc_borders.find(qn(f"w:{side}"))
-        if edge is None:
-            edge = OxmlElement(f"w:{side}")
-            tc_borders.append(edge)
-        edge.set(qn("w:val"), border_style)
-        edge.set(qn("w:sz"), str(sz))
-        edge.set(qn("w:space"), "0")
-        edge.set(qn("w:color"), color_hex)
+    edge = f' w:val="{_docx_border_style(style)}" w:sz="{sz}" w:space="0" w:color="{escape(color_hex)}"/>'
+    return "<w:tcBorders>" + "".join(f"<w:{side}{edge}" for side, _ in _BORDER_EDGES) + "</w:tcBorders>"
 
 
-def _set_cell_shading(cell, fill_hex: str) -> None:
-    cleaned = (fill_hex or "").strip().lstrip("#")
-    if len(cleaned) != 6:
-        return
-    tc_pr = cell._tc.get_or_add_tcPr()
-    shd = tc_pr.find(qn("w:shd"))
-    if shd is None:
-        shd = OxmlElement("w:shd")
-        tc_pr.append(shd)
-    shd.set(qn("w:val"), "clear")
-    shd.set(qn("w:color"), "auto")
-    shd.set(qn("w:fill"), cleaned)
+def _cell_shading_xml(fill_hex: str) -> str:
+    cleaned = _hex_digits(fill_hex, "")
+    if not cleaned:
+        return ""
+    return f'<w:shd w:val="clear" w:color="auto" w:fill="{escape(cleaned)}"/>'
+
+
+_RUN_BREAK_RE = re.compile(r"([\t\r\n])")
+_W_NSDECLS = nsdecls("w")
+
+
+def _run_text_xml(text: str) -> str:
+    # Same run content python-docx writes for ``cell.text = text``.
+    parts: List[str] = []
+    for chunk in _RUN_BREAK_RE.split(text):
+        if not chunk:
+            continue
+        if chunk == "\t":
+            parts.append("<w:tab/>")
+        elif chunk in "\r\n":
+            parts.append("<w:br/>")
+        elif len(chunk.strip()) < len(chunk):
+            parts.append(f'<w:t xml:space="preserve">{escape(chunk, quote=False)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(chunk, quote=False)}</w:t>")
+    return "".join(parts)
+
+
+def _append_table_rows(
+    table,
+    rows: Sequence[Sequence[str]],
+    *,
+    borders_xml: str,
+    row_fills: Tuple[str, str, str],
+    paragraph_xml: str,
+    header_run_xml: str,
+    body_run_xml: str,
+) -> None:
+    # Rows are serialized and parsed in one pass rather than built cell by cell.
+    tbl = table._tbl
+    widths = [grid_col.get(qn("w:w")) for grid_col in tbl.tblGrid.gridCol_lst]
+    header_fill, odd_fill, even_fill = (_cell_shading_xml(fill) for fill in row_fills)
+    cell_props = [
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>{borders_xml}' for width in widths
+    ]
+    parts: List[str] = [f"<w:tbl {nsdecls('w')}>"]
+    for r_idx, row in enumerate(rows):
+        if r_idx == 0:
+            fill_xml, run_xml = header_fill, header_run_xml
+        else:
+            fill_xml, run_xml = (odd_fill if r_idx % 2 == 1 else even_fill), body_run_xml
+        parts.append("<w:tr>")
+        for c_idx, props in enumerate(cell_props):
+            value = row[c_idx] if c_idx < len(row) else ""
+            parts.append(props)
+            parts.append(fill_xml)
+            parts.append("</w:tcPr><w:p>")
+            parts.append(paragraph_xml)
+            parts.append("<w:r>")
+            parts.append(run_xml)
+            parts.append(_run_text_xml(value))
+            parts.append("</w:r></w:p></w:tc>")
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+    tbl.extend(list(parse_xml("".join(parts))))
+
+
+def _table_paragraph_xml(alignment, line_spacing) -> str:
+    paragraph = Paragraph(OxmlElement("w:p"), None)
+    paragraph.alignment = alignment
+    paragraph.paragraph_format.line_spacing = line_spacing
+    p_pr = paragraph._p.pPr
+    return "" if p_pr is None else etree.tostring(p_pr, encoding="unicode")
+
+
+_PARAGRAPH_ROLE_FILLS = {
+    "tip": "E0F2FE",
+    "warning": "FEF3C7",
+    "info": "DBEAFE",
+    "success": "DCFCE7",
+    "callout": "EEF2FF",
+    "summary": "F1F5F9",
+}
+
+
+@lru_cache(maxsize=64)
+def _shading_template(fill_hex: str):
+    shd = OxmlElement("w:shd")
+    shd.set(_W_VAL, "clear")
+    shd.set(_W_COLOR, "auto")
+    shd.set(_W_FILL, fill_hex)
+    return shd
 
 
 def _set_paragraph_shading(paragraph, fill_hex: str) -> None:
-    cleaned = (fill_hex or "").strip().lstrip("#")
-    if len(cleaned) != 6:
+    cleaned = _hex_digits(fill_hex, "")
+    if not cleaned:
         return
     p_pr = paragraph._p.get_or_add_pPr()
-    shd = p_pr.find(qn("w:shd"))
+    shd = p_pr.find(_W_SHD)
     if shd is None:
-        shd = OxmlElement("w:shd")
-        p_pr.append(shd)
-    shd.set(qn("w:val"), "clear")
-    shd.set(qn("w:color"), "auto")
-    shd.set(qn("w:fill"), cleaned)
+        p_pr.append(deepcopy(_shading_template(cleaned)))
+        return
+    shd.set(_W_VAL, "clear")
+    shd.set(_W_COLOR, "auto")
+    shd.set(_W_FILL, cleaned)
+
+
+@lru_cache(maxsize=128)
+def _run_properties_template(
+    font_name: str,
+    size_pt: float,
+    color_hex: str,
+    bold: bool | None,
+    italic: bool | None,
+):
+    run = Run(OxmlElement("w:r"), None)
+    run.font.name = font_name
+    run.font.size = _pt(size_pt)
+    run.font.color.rgb = _hex_to_rgb(color_hex)
+    if bold is not None:
+        run.font.bold = bold
+    if italic is not None:
+        run.font.italic = italic
+    return run._r.rPr
 
 
 def _style_paragraph_runs(
@@ -604,11 +740,16 @@ def _style_paragraph_runs(
     bold: bool | None = None,
     italic: bool | None = None,
 ) -> None:
-    color = _hex_to_rgb(color_hex)
+    template = None
     for run in paragraph.runs:
+        if run._r.rPr is None:
+            if template is None:
+                template = _run_properties_template(font_name, max(1.0, size_pt), color_hex, bold, italic)
+            run._r.insert(0, deepcopy(template))
+            continue
         run.font.name = font_name
-        run.font.size = Pt(max(1.0, size_pt))
-        run.font.color.rgb = color
+        run.font.size = _pt(max(1.0, size_pt))
+        run.font.color.rgb = _hex_to_rgb(color_hex)
         if bold is not None:
             run.font.bold = bold
         if italic is not None:
@@ -621,8 +762,8 @@ def _preview_page_number_text(mode: str, format_template: str) -> str:
 
 def _resolved_page_number_text(current_page: int, total_pages: int, mode: str, format_template: str) -> str:
     text = _normalize_page_template(mode, format_template)
-    text = re.sub(r"X", str(current_page), text, flags=re.IGNORECASE)
-    text = re.sub(r"Y", str(total_pages), text, flags=re.IGNORECASE)
+    text = _PAGE_X_RE.sub(str(current_page), text)
+    text = _PAGE_Y_RE.sub(str(total_pages), text)
     return text
 
 
@@ -720,6 +861,12 @@ def _find_libreoffice_binary() -> str | None:
     return None
 
 
+# Concurrent soffice processes sharing one user profile hand off to each other or fail outright.
+_LIBREOFFICE_LOCK = threading.Lock()
+# docx2pdf drives a single Word instance over COM/AppleScript, which is not safe to share across threads.
+_DOCX2PDF_LOCK = threading.Lock()
+
+
 def _convert_docx_to_pdf(docx_path: Path, pdf_path: Path) -> Tuple[bool, str]:
     errors: List[str] = []
 
@@ -727,7 +874,8 @@ def _convert_docx_to_pdf(docx_path: Path, pdf_path: Path) -> Tuple[bool, str]:
         try:
             from docx2pdf import convert as docx2pdf_convert  # type: ignore
 
-            docx2pdf_convert(str(docx_path), str(pdf_path))
+            with _DOCX2PDF_LOCK:
+                docx2pdf_convert(str(docx_path), str(pdf_path))
             if pdf_path.exists() and pdf_path.stat().st_size > 0:
                 return True, "docx2pdf"
             errors.append("docx2pdf produced no file")
@@ -748,7 +896,8 @@ def _convert_docx_to_pdf(docx_path: Path, pdf_path: Path) -> Tuple[bool, str]:
             str(pdf_path.parent),
         ]
         try:
-            result = subprocess.run(cmd, timeout=90, check=False, capture_output=True, text=True)
+            with _LIBREOFFICE_LOCK:
+                result = subprocess.run(cmd, timeout=90, check=False, capture_output=True, text=True)
             produced = pdf_path.parent / f"{docx_path.stem}.pdf"
             if result.returncode == 0 and produced.exists() and produced.stat().st_size > 0:
                 if produced != pdf_path:
@@ -1251,35 +1400,88 @@ def _write_emergency_pdf(pdf_path: Path, message: str) -> Tuple[bool, str]:
         return False, f"emergency_pdf failed: {exc}"
 
 
+_STORE_EXTENSIONS = ("docx", "pdf", "zip", "html", "md", "txt")
+_STORE_FILE_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
 class FileStore:
     def __init__(self, base_dir: str, ttl_seconds: int = 60 * 60 * 6) -> None:
         root = Path(base_dir) if base_dir else Path(tempfile.gettempdir()) / "notesforge_exports"
         root.mkdir(parents=True, exist_ok=True)
         self.base_dir = root
         self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, Tuple[Path, float]] = OrderedDict()
+        self._reconcile()
 
-    def cleanup(self) -> None:
+    def _reconcile(self) -> None:
+        # Exports left over from a previous process are indexed here so cleanup() reaches them.
         now = time.time()
+        existing: List[Tuple[float, Path]] = []
         for file_path in self.base_dir.glob("*"):
-            if not file_path.is_file():
+            try:
+                if file_path.is_file():
+                    existing.append((file_path.stat().st_mtime, file_path))
+            except OSError:
                 continue
-            age = now - file_path.stat().st_mtime
-            if age > self.ttl_seconds:
+        existing.sort(key=lambda item: item[0])
+        with self._lock:
+            for created_at, file_path in existing:
+                if now - created_at > self.ttl_seconds:
+                    file_path.unlink(missing_ok=True)
+                else:
+                    self._index[file_path.name] = (file_path, created_at)
+
+    def cleanup(self) -> None:
+        now = time.time()
+        with self._lock:
+            while self._index:
+                _, (file_path, created_at) = next(iter(self._index.items()))
+                if now - created_at <= self.ttl_seconds:
+                    break
+                self._index.popitem(last=False)
                 try:
-                    file_path.unlink()
+                    file_path.unlink(missing_ok=True)
                 except OSError:
                     continue
 
     def reserve_path(self, ext: str) -> Tuple[str, Path]:
         file_id = uuid4().hex
         path = self.base_dir / f"{file_id}.{ext}"
+        with self._lock:
+            self._index[path.name] = (path, time.time())
         return file_id, path
 
     def resolve_path(self, file_id: str) -> Path | None:
-        if not file_id or not all(ch in "0123456789abcdef" for ch in file_id.lower()):
+        # Ids are uuid4().hex, so anything but 32 lowercase hex digits cannot be in the store.
+        if not _STORE_FILE_ID_RE.fullmatch(file_id):
+            return None
+        now = time.time()
+        with self._lock:
+            for ext in _STORE_EXTENSIONS:
+                entry = self._index.get(f"{file_id}.{ext}")
+                if entry is not None:
+                    break
+        if entry is None:
+            return self._resolve_unindexed(file_id, now)
+        candidate, created_at = entry
+        # cleanup() only runs periodically, so an expired entry may still be indexed.
+        if now - created_at > self.ttl_seconds:
             return None
-        matches = list(self.base_dir.glob(f"{file_id}.*"))
-        return matches[0] if matches else None
+        return candidate if candidate.is_file() else None
+
+    def _resolve_unindexed(self, file_id: str, now: float) -> Path | None:
+        # Another worker sharing base_dir may have written it; that worker's index owns its cleanup.
+        for ext in _STORE_EXTENSIONS:
+            candidate = self.base_dir / f"{file_id}.{ext}"
+            try:
+                if not candidate.is_file():
+                    continue
+                created_at = candidate.stat().st_mtime
+            except OSError:
+                continue
+            return candidate if now - created_at <= self.ttl_seconds else None
+        return None
 
 
 class DocumentExporter:
@@ -1307,7 +1509,6 @@ class DocumentExporter:
         formatting: FormattingOptions,
         security: GenerateSecurityPayload,
     ) -> Tuple[str, Path, List[str]]:
-        self.store.cleanup()
         warnings: List[str] = []
         file_id, path = self.store.reserve_path("docx")
 
@@ -1636,6 +1837,93 @@ class DocumentExporter:
             default="#F8FAFC",
         )
 
+        body_size = float(theme.bodyStyle.size or 12)
+        caption_size = max(11.0, body_size - 1.0)
+        paragraph_before = _pt(max(0.0, paragraph_before_pt))
+        paragraph_after = _pt(max(0.0, paragraph_after_pt))
+        heading_before = _pt(max(0.0, heading_before_pt))
+        heading_after = _pt(max(0.0, heading_after_pt))
+        caption_before = _pt(2)
+        caption_after = _pt(max(4.0, paragraph_after_pt))
+        first_line_indent = _inches(max(0.0, paragraph_first_indent_em) * 0.15)
+        quote_indent = _inches(max(0.0, quote_indent_in))
+        code_indent = _inches(max(0.0, code_indent_in))
+        paragraph_align = _docx_alignment(paragraph_alignment)
+        table_align = _docx_alignment(table_text_alignment)
+        code_background = _style_str(styles, "code_background", "codeBackground", default="#0f172a")
+        code_text = _style_str(styles, "code_text", "codeText", default="#1f2937")
+        ascii_background = _style_str(styles, "ascii_background", "asciiBackground", default=code_background)
+        ascii_font_name = _font_primary(
+            _style_str(styles, "ascii_font_family", "asciiFontFamily", default=code_font_name)
+        )
+        ascii_text = _style_str(styles, "ascii_text", "asciiText", default=code_text)
+        ascii_font_size = max(8.0, code_font_size - 1.0)
+        separator_color = _style_str(styles, "table_border", "tableBorder", default="#D1D5DB")
+        heading_style = theme.headingStyle
+        heading_tokens = (
+            heading_style.h1,
+            heading_style.h2,
+            heading_style.h3,
+            heading_style.h4,
+            heading_style.h5,
+            heading_style.h6,
+        )
+        heading_styles: list[tuple[str, float, str, bool]] = []
+        for level, token in enumerate(heading_tokens, start=1):
+            heading_styles.append(
+                (
+                    _font_primary(_style_str(styles, f"h{level}_family", f"h{level}Family", default=font_name)),
+                    float(token.size or max(12, 26 - (level * 2))),
+                    token.color or theme.primaryColor,
+                    str(token.weight or "600") in _BOLD_WEIGHTS,
+                )
+            )
+        section_heading_size = float(theme.headingStyle.h1.size or 18)
+        section_heading_color = theme.headingStyle.h1.color or theme.primaryColor
+        bullet_indents: dict[int, Inches] = {}
+
+        def bullet_indent(item_level: int) -> Inches:
+            indent = bullet_indents.get(item_level)
+            if indent is None:
+                indent = _inches(max(0.0, bullet_base_indent_in + (bullet_indent_per_level_in * item_level)))
+                bullet_indents[item_level] = indent
+            return indent
+
+        body = document._body
+        body_sect_pr = document.element.body.sectPr
+        style_ids: dict[str, str | None] = {}
+
+        def add_paragraph(text: str = "", style: str | None = None) -> Paragraph:
+            # Same result as document.add_paragraph, minus the per-call scan for the
+            # trailing sectPr and the by-name style lookup across styles.xml.
+            p_element = OxmlElement("w:p")
+            if body_sect_pr is not None:
+                body_sect_pr.addprevious(p_element)
+            else:
+                document.element.body.append(p_element)
+            paragraph = Paragraph(p_element, body)
+            if text:
+                # One parse of the run markup instead of python-docx's per-character run builder.
+                p_element.append(parse_xml(f"<w:r {_W_NSDECLS}>{_run_text_xml(text)}</w:r>"))
+            if style is not None:
+                if style not in style_ids:
+                    style_ids[style] = document.part.get_style_id(style, WD_STYLE_TYPE.PARAGRAPH)
+                p_element.style = style_ids[style]
+            return paragraph
+
+        def add_heading(text: str = "", level: int = 1) -> Paragraph:
+            return add_paragraph(text, f"Heading {level}")
+
+        # Normal, and the list/table styles based on it, already carries the body font,
+        # size and color, so runs that match it inherit them instead of repeating an rPr.
+        body_runs_inherit = body_size >= 1.0
+
+        def style_body_runs(paragraph: Paragraph, run_font: str = font_name) -> None:
+            if body_runs_inherit and run_font == font_name:
+                return
+            _style_paragraph_runs(paragraph, font_name=run_font, size_pt=body_size, color_hex=body_color)
+
+        table_markup: dict[str, object] | None = None
         figure_entries, table_entries = _collect_caption_entries(nodes)
         caption_state = CaptionTracker()
         has_written_content = False
@@ -1649,132 +1937,86 @@ class DocumentExporter:
                     caption_state.figure_chapter = 0
                     caption_state.table_chapter = 0
                     title = f"CHAPTER {caption_state.chapter_idx}: {node.text or 'Chapter'}"
-                    p = document.add_heading(title, level=1)
+                    p = add_heading(title, level=1)
                 elif node.type == "appendix":
-                    p = document.add_heading(f"Appendix: {node.text or 'Appendix'}", level=1)
+                    p = add_heading(f"Appendix: {node.text or 'Appendix'}", level=1)
                 else:
-                    p = document.add_heading(node.text or node.type.replace("_", " ").title(), level=1)
-                p.paragraph_format.space_before = Pt(max(0.0, heading_before_pt))
-                p.paragraph_format.space_after = Pt(max(0.0, heading_after_pt))
+                    p = add_heading(node.text or node.type.replace("_", " ").title(), level=1)
+                p.paragraph_format.space_before = heading_before
+                p.paragraph_format.space_after = heading_after
                 p.paragraph_format.line_spacing = line_spacing
                 _style_paragraph_runs(
                     p,
-                    font_name=_font_primary(_style_str(styles, "h1_family", "h1Family", default=font_name)),
-                    size_pt=float(getattr(theme.headingStyle, "h1").size or 18),
-                    color_hex=getattr(theme.headingStyle, "h1").color or theme.primaryColor,
+                    font_name=heading_styles[0][0],
+                    size_pt=section_heading_size,
+                    color_hex=section_heading_color,
                     bold=True,
                 )
             elif node.type == "toc":
-                p = document.add_heading(node.text or "Table of Contents", level=1)
+                p = add_heading(node.text or "Table of Contents", level=1)
                 p.paragraph_format.line_spacing = line_spacing
-                toc_p = document.add_paragraph()
+                toc_p = add_paragraph()
                 _append_toc_field(toc_p)
                 toc_p.paragraph_format.line_spacing = line_spacing
-                _style_paragraph_runs(
-                    toc_p,
-                    font_name=font_name,
-                    size_pt=float(theme.bodyStyle.size or 12),
-                    color_hex=body_color,
-                )
+                style_body_runs(toc_p)
             elif node.type == "list_of_tables":
-                p = document.add_heading(node.text or "List of Tables", level=1)
+                p = add_heading(node.text or "List of Tables", level=1)
                 p.paragraph_format.line_spacing = line_spacing
                 for entry in table_entries or ["Table entries are generated when captions are available."]:
-                    item = document.add_paragraph(entry, style="List Bullet")
+                    item = add_paragraph(entry, style="List Bullet")
                     item.paragraph_format.line_spacing = line_spacing
-                    _style_paragraph_runs(
-                        item,
-                        font_name=font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(item)
             elif node.type == "list_of_figures":
-                p = document.add_heading(node.text or "List of Figures", level=1)
+                p = add_heading(node.text or "List of Figures", level=1)
                 p.paragraph_format.line_spacing = line_spacing
                 for entry in figure_entries or ["Figure entries are generated when captions are available."]:
-                    item = document.add_paragraph(entry, style="List Bullet")
+                    item = add_paragraph(entry, style="List Bullet")
                     item.paragraph_format.line_spacing = line_spacing
-                    _style_paragraph_runs(
-                        item,
-                        font_name=font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(item)
             elif node.type == "reference":
-                p = document.add_paragraph(node.text, style="List Number")
+                p = add_paragraph(node.text, style="List Number")
                 p.paragraph_format.line_spacing = line_spacing
-                _style_paragraph_runs(
-                    p,
-                    font_name=font_name,
-                    size_pt=float(theme.bodyStyle.size or 12),
-                    color_hex=body_color,
-                )
+                style_body_runs(p)
             elif node.type == "heading":
                 level = max(1, min(6, node.level))
-                p = document.add_heading(node.text, level=level)
-                p.paragraph_format.space_before = Pt(max(0.0, heading_before_pt))
-                p.paragraph_format.space_after = Pt(max(0.0, heading_after_pt))
+                p = add_heading(node.text, level=level)
+                p.paragraph_format.space_before = heading_before
+                p.paragraph_format.space_after = heading_after
                 p.paragraph_format.line_spacing = line_spacing
-                token = getattr(theme.headingStyle, f"h{level}")
+                heading_font, heading_size, heading_color, heading_bold = heading_styles[level - 1]
                 _style_paragraph_runs(
                     p,
-                    font_name=_font_primary(
-                        _style_str(
-                            styles,
-                            f"h{level}_family",
-                            f"h{level}Family",
-                            default=font_name,
-                        )
-                    ),
-                    size_pt=float(token.size or max(12, 26 - (level * 2))),
-                    color_hex=token.color or theme.primaryColor,
-                    bold=str(token.weight or "600") in {"600", "700", "800", "900"},
+                    font_name=heading_font,
+                    size_pt=heading_size,
+                    color_hex=heading_color,
+                    bold=heading_bold,
                 )
             elif node.type == "paragraph":
-                p = document.add_paragraph(node.text)
+                p = add_paragraph(node.text)
                 effective_align = node.align if node.align and node.align != "left" else paragraph_alignment
                 p.alignment = _docx_alignment(effective_align)
-                p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                p.paragraph_format.space_before = paragraph_before
+                p.paragraph_format.space_after = paragraph_after
                 p.paragraph_format.line_spacing = line_spacing
-                p.paragraph_format.first_line_indent = Inches(max(0.0, paragraph_first_indent_em) * 0.15)
-                if getattr(node, "role", "paragraph") == "quote":
-                    p.paragraph_format.left_indent = Inches(max(0.0, quote_indent_in))
-                _style_paragraph_runs(
-                    p,
-                    font_name=font_name,
-                    size_pt=float(theme.bodyStyle.size or 12),
-                    color_hex=body_color,
-                )
+                p.paragraph_format.first_line_indent = first_line_indent
                 role = getattr(node, "role", "paragraph")
-                role_fill_map = {
-                    "tip": "E0F2FE",
-                    "warning": "FEF3C7",
-                    "info": "DBEAFE",
-                    "success": "DCFCE7",
-                    "callout": "EEF2FF",
-                    "summary": "F1F5F9",
-                }
-                if role in role_fill_map:
-                    _set_paragraph_shading(p, role_fill_map[role])
+                if role == "quote":
+                    p.paragraph_format.left_indent = quote_indent
+                style_body_runs(p)
+                role_fill = _PARAGRAPH_ROLE_FILLS.get(role)
+                if role_fill:
+                    _set_paragraph_shading(p, role_fill)
             elif node.type == "bullet":
                 levels = node.levels or []
                 for idx, item in enumerate(node.items or []):
                     item_level = levels[idx] if idx < len(levels) else 0
-                    p = document.add_paragraph(item, style="List Bullet")
-                    p.alignment = _docx_alignment(paragraph_alignment)
-                    p.paragraph_format.left_indent = Inches(
-                        max(0.0, bullet_base_indent_in + (bullet_indent_per_level_in * item_level))
-                    )
-                    p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                    p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                    p = add_paragraph(item, style="List Bullet")
+                    p.alignment = paragraph_align
+                    p.paragraph_format.left_indent = bullet_indent(item_level)
+                    p.paragraph_format.space_before = paragraph_before
+                    p.paragraph_format.space_after = paragraph_after
                     p.paragraph_format.line_spacing = line_spacing
-                    _style_paragraph_runs(
-                        p,
-                        font_name=bullet_font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(p, bullet_font_name)
             elif node.type == "checklist":
                 levels = node.levels or []
                 checks = node.checks or []
@@ -1782,108 +2024,68 @@ class DocumentExporter:
                     item_level = levels[idx] if idx < len(levels) else 0
                     checked = checks[idx] if idx < len(checks) else False
                     label = f"[{'x' if checked else ' '}] {item}"
-                    p = document.add_paragraph(label, style="List Bullet")
-                    p.alignment = _docx_alignment(paragraph_alignment)
-                    p.paragraph_format.left_indent = Inches(
-                        max(0.0, bullet_base_indent_in + (bullet_indent_per_level_in * item_level))
-                    )
-                    p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                    p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                    p = add_paragraph(label, style="List Bullet")
+                    p.alignment = paragraph_align
+                    p.paragraph_format.left_indent = bullet_indent(item_level)
+                    p.paragraph_format.space_before = paragraph_before
+                    p.paragraph_format.space_after = paragraph_after
                     p.paragraph_format.line_spacing = line_spacing
-                    _style_paragraph_runs(
-                        p,
-                        font_name=bullet_font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(p, bullet_font_name)
             elif node.type == "numbered":
                 levels = node.levels or []
                 for idx, item in enumerate(node.items or []):
                     item_level = levels[idx] if idx < len(levels) else 0
-                    p = document.add_paragraph(item, style="List Number")
-                    p.alignment = _docx_alignment(paragraph_alignment)
-                    p.paragraph_format.left_indent = Inches(
-                        max(0.0, bullet_base_indent_in + (bullet_indent_per_level_in * item_level))
-                    )
-                    p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                    p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                    p = add_paragraph(item, style="List Number")
+                    p.alignment = paragraph_align
+                    p.paragraph_format.left_indent = bullet_indent(item_level)
+                    p.paragraph_format.space_before = paragraph_before
+                    p.paragraph_format.space_after = paragraph_after
                     p.paragraph_format.line_spacing = line_spacing
-                    _style_paragraph_runs(
-                        p,
-                        font_name=bullet_font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(p, bullet_font_name)
             elif node.type == "code":
-                p = document.add_paragraph(node.text)
-                p.paragraph_format.left_indent = Inches(max(0.0, code_indent_in))
-                p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                p = add_paragraph(node.text)
+                p.paragraph_format.left_indent = code_indent
+                p.paragraph_format.space_before = paragraph_before
+                p.paragraph_format.space_after = paragraph_after
                 p.paragraph_format.line_spacing = line_spacing
-                _set_paragraph_shading(
-                    p,
-                    _style_str(styles, "code_background", "codeBackground", default="#0f172a"),
-                )
+                _set_paragraph_shading(p, code_background)
                 _style_paragraph_runs(
                     p,
                     font_name=code_font_name,
                     size_pt=code_font_size,
-                    color_hex=_style_str(styles, "code_text", "codeText", default="#1f2937"),
+                    color_hex=code_text,
                 )
             elif node.type == "equation":
-                p = document.add_paragraph(node.text)
+                p = add_paragraph(node.text)
                 p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                p.paragraph_format.left_indent = Inches(max(0.0, code_indent_in))
-                p.paragraph_format.space_before = Pt(max(0.0, paragraph_before_pt))
-                p.paragraph_format.space_after = Pt(max(0.0, paragraph_after_pt))
+                p.paragraph_format.left_indent = code_indent
+                p.paragraph_format.space_before = paragraph_before
+                p.paragraph_format.space_after = paragraph_after
                 p.paragraph_format.line_spacing = line_spacing
-                _set_paragraph_shading(
-                    p,
-                    _style_str(styles, "code_background", "codeBackground", default="#0f172a"),
-                )
+                _set_paragraph_shading(p, code_background)
                 _style_paragraph_runs(
                     p,
                     font_name=code_font_name,
                     size_pt=code_font_size,
-                    color_hex=_style_str(styles, "code_text", "codeText", default="#1f2937"),
+                    color_hex=code_text,
                     italic=True,
                 )
             elif node.type == "ascii":
-                p = document.add_paragraph(node.text)
-                p.paragraph_format.left_indent = Inches(0)
+                p = add_paragraph(node.text)
+                p.paragraph_format.left_indent = _inches(0)
                 p.paragraph_format.line_spacing = line_spacing
                 p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                _set_paragraph_shading(
-                    p,
-                    _style_str(
-                        styles,
-                        "ascii_background",
-                        "asciiBackground",
-                        default=_style_str(styles, "code_background", "codeBackground", default="#0f172a"),
-                    ),
-                )
+                _set_paragraph_shading(p, ascii_background)
                 _style_paragraph_runs(
                     p,
-                    font_name=_font_primary(
-                        _style_str(
-                            styles,
-                            "ascii_font_family",
-                            "asciiFontFamily",
-                            default=code_font_name,
-                        )
-                    ),
-                    size_pt=max(8.0, code_font_size - 1.0),
-                    color_hex=_style_str(
-                        styles,
-                        "ascii_text",
-                        "asciiText",
-                        default=_style_str(styles, "code_text", "codeText", default="#1f2937"),
-                    ),
+                    font_name=ascii_font_name,
+                    size_pt=ascii_font_size,
+                    color_hex=ascii_text,
                 )
             elif node.type in {"image", "figure"}:
                 stream = _resolve_image_stream(node.source, warnings)
                 if stream:
-                    p = document.add_paragraph()
+                    p = add_paragraph()
                     p.alignment = _docx_alignment(node.align or "center")
                     run = p.add_run()
                     width_mm = max(20.0, min(170.0, 170.0 * ((node.scale or 100.0) / 100.0)))
@@ -1891,58 +2093,53 @@ class DocumentExporter:
                         run.add_picture(stream, width=Mm(width_mm))
                     except Exception as exc:
                         warnings.append(f"Failed to render image '{node.source}': {exc}")
-                        fallback = document.add_paragraph(f"[Image: {node.source}]")
+                        fallback = add_paragraph(f"[Image: {node.source}]")
                         fallback.alignment = _docx_alignment(node.align or "center")
                 else:
-                    fallback = document.add_paragraph(f"[Image: {node.source or 'missing source'}]")
+                    fallback = add_paragraph(f"[Image: {node.source or 'missing source'}]")
                     fallback.alignment = _docx_alignment(node.align or "center")
-                    _style_paragraph_runs(
-                        fallback,
-                        font_name=font_name,
-                        size_pt=float(theme.bodyStyle.size or 12),
-                        color_hex=body_color,
-                    )
+                    style_body_runs(fallback)
 
                 caption_text = (node.caption or node.text or "").strip()
                 if node.type == "figure" or caption_text:
                     number = _next_caption_number(caption_state, "figure")
-                    cp = document.add_paragraph(f"Figure {number}: {caption_text or node.source or 'Image'}")
+                    cp = add_paragraph(f"Figure {number}: {caption_text or node.source or 'Image'}")
                     cp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    cp.paragraph_format.space_before = Pt(2)
-                    cp.paragraph_format.space_after = Pt(max(4.0, paragraph_after_pt))
+                    cp.paragraph_format.space_before = caption_before
+                    cp.paragraph_format.space_after = caption_after
                     cp.paragraph_format.line_spacing = line_spacing
                     _style_paragraph_runs(
                         cp,
                         font_name=font_name,
-                        size_pt=max(11.0, float(theme.bodyStyle.size or 12) - 1.0),
+                        size_pt=caption_size,
                         color_hex="#475569",
                         italic=True,
                     )
             elif node.type == "table_caption":
                 number = _next_caption_number(caption_state, "table")
-                cp = document.add_paragraph(f"Table {number}: {node.text}")
+                cp = add_paragraph(f"Table {number}: {node.text}")
                 cp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                cp.paragraph_format.space_before = Pt(2)
-                cp.paragraph_format.space_after = Pt(max(4.0, paragraph_after_pt))
+                cp.paragraph_format.space_before = caption_before
+                cp.paragraph_format.space_after = caption_after
                 cp.paragraph_format.line_spacing = line_spacing
                 _style_paragraph_runs(
                     cp,
                     font_name=font_name,
-                    size_pt=max(11.0, float(theme.bodyStyle.size or 12) - 1.0),
+                    size_pt=caption_size,
                     color_hex="#475569",
                     italic=True,
                 )
             elif node.type == "figure_caption":
                 number = _next_caption_number(caption_state, "figure")
-                cp = document.add_paragraph(f"Figure {number}: {node.text}")
+                cp = add_paragraph(f"Figure {number}: {node.text}")
                 cp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                cp.paragraph_format.space_before = Pt(2)
-                cp.paragraph_format.space_after = Pt(max(4.0, paragraph_after_pt))
+                cp.paragraph_format.space_before = caption_before
+                cp.paragraph_format.space_after = caption_after
                 cp.paragraph_format.line_spacing = line_spacing
                 _style_paragraph_runs(
                     cp,
                     font_name=font_name,
-                    size_pt=max(11.0, float(theme.bodyStyle.size or 12) - 1.0),
+                    size_pt=caption_size,
                     color_hex="#475569",
                     italic=True,
                 )
@@ -1950,59 +2147,45 @@ class DocumentExporter:
                 rows = node.rows or []
                 if not rows:
                     continue
-                cols = len(rows[0])
-                table = document.add_table(rows=len(rows), cols=cols)
+                table = document.add_table(rows=0, cols=len(rows[0]))
                 table.style = "Table Grid"
-                for r_idx, row in enumerate(rows):
-                    for c_idx in range(cols):
-                        value = row[c_idx] if c_idx < len(row) else ""
-                        cell = table.cell(r_idx, c_idx)
-                        cell.text = value
-                        _set_cell_borders(
-                            cell,
+                if table_markup is None:
+                    table_markup = {
+                        "borders_xml": _cell_borders_xml(
                             color=table_border_color,
                             width_pt=table_border_width,
                             style=table_border_style,
-                        )
-                        if r_idx == 0:
-                            _set_cell_shading(cell, table_header_fill)
-                        elif r_idx % 2 == 1:
-                            _set_cell_shading(cell, table_odd_fill)
-                        else:
-                            _set_cell_shading(cell, table_even_fill)
-                        for para in cell.paragraphs:
-                            para.alignment = _docx_alignment(table_text_alignment)
-                            para.paragraph_format.line_spacing = line_spacing
-                            _style_paragraph_runs(
-                                para,
-                                font_name=font_name,
-                                size_pt=float(theme.bodyStyle.size or 12),
-                                color_hex=table_header_text if r_idx == 0 else body_color,
-                                bold=True if r_idx == 0 else None,
-                            )
+                        ),
+                        "row_fills": (table_header_fill, table_odd_fill, table_even_fill),
+                        "paragraph_xml": _table_paragraph_xml(table_align, line_spacing),
+                        "header_run_xml": etree.tostring(
+                            _run_properties_template(font_name, max(1.0, body_size), table_header_text, True, None),
+                            encoding="unicode",
+                        ),
+                        "body_run_xml": ""
+                        if body_runs_inherit
+                        else etree.tostring(
+                            _run_properties_template(font_name, max(1.0, body_size), body_color, None, None),
+                            encoding="unicode",
+                        ),
+                    }
+                _append_table_rows(table, rows, **table_markup)
             elif node.type == "separator":
-                p = document.add_paragraph("")
-                _apply_paragraph_separator(
-                    p,
-                    "top",
-                    _style_str(styles, "table_border", "tableBorder", default="#D1D5DB"),
-                    0.75,
-                    "single",
-                )
-                p.paragraph_format.space_before = Pt(6)
-                p.paragraph_format.space_after = Pt(6)
+                p = add_paragraph("")
+                _apply_paragraph_separator(p, "top", separator_color, 0.75, "single")
+                p.paragraph_format.space_before = _pt(6)
+                p.paragraph_format.space_after = _pt(6)
             elif node.type == "pagebreak":
                 document.add_page_break()
 
             if node.type != "pagebreak":
                 has_written_content = True
 
-        document.save(str(path))
-
         if security.removeMetadata:
-            remove_docx_metadata(path)
+            clear_docx_metadata(document)
         if security.disableEditingDocx:
-            disable_docx_editing(path)
+            protect_docx_editing(document)
+        document.save(str(path))
 
         return file_id, path, warnings
 
@@ -2015,7 +2198,6 @@ class DocumentExporter:
         security: GenerateSecurityPayload,
     ) -> ExportResult:
         requested = target_format.lower()
-        self.store.cleanup()
 
         if requested == "html":
             file_id, html_path = self.store.reserve_path("html")
@@ -1,20 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import re
+import stat
 import time
 import zipfile
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, suppress
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from threading import RLock, Thread
-from typing import Any, Dict, List, Mapping, MutableMapping
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, MutableMapping, Set
 from uuid import uuid4
 
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 
 from .exporter import DocumentExporter, ExportResult, FileStore
@@ -39,14 +46,19 @@ from .models import (
     TemplateDefinition,
     ThemePayload,
 )
-from .markers import MARKER_REGEX, marker_catalog_payload, normalize_marker
-from .parser import parse_notesforge
+from .markers import marker_catalog_payload, normalize_marker, split_marker_line
+from .parser import ParseResult, parse_notesforge
 from .pdf_conversion import PdfConversionService, persist_uploaded_processing_file
 from .templates_repo import TemplateRepo
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 
 logger = logging.getLogger("notesforge.v10")
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
 
 APP_VERSION = "10.0.0"
 MAX_BODY_BYTES = 2_000_000
@@ -176,24 +188,96 @@ def _resolve_frontend_dist() -> Path | None:
     return None
 
 
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity are valid for the stdlib parser (and anything it wrote), not for orjson.
+            pass
+    return json.loads(data)
+
+
+def _json_dumps(payload: Mapping[str, Any], *, compact: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        try:
+            return orjson.dumps(payload, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles.
+            pass
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def _read_json_dict(path: Path) -> Dict[str, Any] | None:
-    if not path.exists() or not path.is_file():
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
         return None
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
+        raw = _json_loads(path.read_bytes())
+    except (ValueError, OSError):
         return None
     return raw if isinstance(raw, dict) else None
 
 
-def _write_json(path: Path, payload: Mapping[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+_WRITTEN_DIGESTS: Dict[str, bytes] = {}
+_ENSURED_DIRS: Set[str] = set()
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _write_json(
+    path: Path,
+    payload: Mapping[str, Any],
+    *,
+    encoded: bytes | None = None,
+    compact: bool = False,
+) -> None:
+    data = encoded if encoded is not None else _json_dumps(payload, compact=compact)
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    cache_key = str(path)
+    if _WRITTEN_DIGESTS.get(cache_key) == digest and path.is_file():
+        return
+    parent_key = str(path.parent)
+    if parent_key not in _ENSURED_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent_key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            fd = os.open(str(tmp_path), _WRITE_FLAGS, 0o644)
+        except FileNotFoundError:
+            # The directory was removed since it was last ensured; recreate it and retry once.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(tmp_path), _WRITE_FLAGS, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            # Without it a crash right after os.replace can leave an empty file; batch_saves keeps this to one per flush.
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        _WRITTEN_DIGESTS.pop(cache_key, None)
+        _ENSURED_DIRS.discard(parent_key)
+        raise
+    _WRITTEN_DIGESTS[cache_key] = digest
+
+
+_SLUG_INVALID_RE = re.compile(r"[^a-z0-9_]+")
+_SLUG_REPEAT_RE = re.compile(r"_+")
 
 
 def _slugify_key(value: str) -> str:
-    cleaned = re.sub(r"[^a-z0-9_]+", "_", value.strip().lower())
-    cleaned = re.sub(r"_+", "_", cleaned).strip("_")
+    cleaned = _SLUG_INVALID_RE.sub("_", value.strip().lower())
+    cleaned = _SLUG_REPEAT_RE.sub("_", cleaned).strip("_")
     return cleaned or "theme"
 
 
@@ -231,135 +315,145 @@ def _margin_to_mm(value: Any, fallback: float) -> float:
 
 def _deep_merge(base: Mapping[str, Any], incoming: Mapping[str, Any]) -> Dict[str, Any]:
     merged: Dict[str, Any] = dict(base)
+    merged.update(incoming)
     for key, value in incoming.items():
-        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
-            merged[key] = _deep_merge(_as_dict(merged.get(key)), value)
-        else:
-            merged[key] = value
+        if isinstance(value, Mapping):
+            current = base.get(key)
+            if isinstance(current, Mapping):
+                merged[key] = _deep_merge(_as_dict(current), value)
     return merged
 
 
-def _default_config() -> Dict[str, Any]:
-    return {
-        "app": {
-            "name": "NotesForge",
-            "version": APP_VERSION,
-            "theme": "professional",
-        },
-        "app_ui": {
-            "theme": "aurora",
-            "mode": "smooth",
-            "music": {
-                "enabled": False,
-                "volume": 0.35,
-                "playlist_mode": "smooth",
-                "autoplay": False,
-            },
-        },
-        "fonts": {
-            "family": "Times New Roman",
-            "family_code": "JetBrains Mono",
-            "h1_family": "Times New Roman",
-            "h2_family": "Times New Roman",
-            "h3_family": "Times New Roman",
-            "h4_family": "Times New Roman",
-            "h5_family": "Times New Roman",
-            "h6_family": "Times New Roman",
-            "bullet_family": "Times New Roman",
-            "sizes": {
-                "h1": 18,
-                "h2": 16,
-                "h3": 14,
-                "h4": 14,
-                "h5": 12,
-                "h6": 12,
-                "body": 12,
-                "code": 12,
-                "header": 10,
-                "footer": 11,
-                "title": 20,
-                "footnote": 11,
-            },
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "app": {
+        "name": "NotesForge",
+        "version": APP_VERSION,
+        "theme": "professional",
+    },
+    "app_ui": {
+        "theme": "aurora",
+        "mode": "smooth",
+        "music": {
+            "enabled": False,
+            "volume": 0.35,
+            "playlist_mode": "smooth",
+            "autoplay": False,
         },
-        "colors": {
-            "h1": "#1F3A5F",
-            "h2": "#2B6CB0",
-            "h3": "#2B6CB0",
-            "h4": "#334155",
-            "h5": "#475569",
-            "h6": "#64748B",
-            "body": "#17202a",
-            "code_background": "#0f172a",
-            "code_text": "#e2e8f0",
-            "table_header_bg": "#f3f4f6",
-            "table_header_text": "#111827",
-            "table_odd_row": "#ffffff",
-            "table_even_row": "#f8fafc",
-            "table_border": "#d1d5db",
-            "link": "#2563eb",
+    },
+    "fonts": {
+        "family": "Times New Roman",
+        "family_code": "JetBrains Mono",
+        "h1_family": "Times New Roman",
+        "h2_family": "Times New Roman",
+        "h3_family": "Times New Roman",
+        "h4_family": "Times New Roman",
+        "h5_family": "Times New Roman",
+        "h6_family": "Times New Roman",
+        "bullet_family": "Times New Roman",
+        "sizes": {
+            "h1": 18,
+            "h2": 16,
+            "h3": 14,
+            "h4": 14,
+            "h5": 12,
+            "h6": 12,
+            "body": 12,
+            "code": 12,
+            "header": 10,
+            "footer": 11,
+            "title": 20,
+            "footnote": 11,
         },
-        "spacing": {
-            "line_spacing": 1.5,
-            "tab_width": 4,
-            "paragraph_spacing_before": 0,
-            "paragraph_spacing_after": 6,
-            "heading_spacing_before": 10,
-            "heading_spacing_after": 6,
-            "paragraph_first_line_indent": 0,
-            "bullet_base_indent": 0.25,
-            "bullet_indent_per_level": 0.45,
-            "code_indent": 0,
-            "quote_indent": 0.5,
-            "paragraph_alignment": "left",
-        },
-        "page": {
-            "size": "A4",
-            "orientation": "portrait",
-            "margins": {"top": 1.0, "bottom": 1.0, "left": 1.0, "right": 1.0},
-            "border": {
-                "enabled": False,
-                "width": 1,
-                "color": "#000000",
-                "style": "single",
-                "offset": 24,
-                "shadow": False,
-                "frame": False,
-            },
-        },
-        "header": {
-            "enabled": True,
-            "text": "",
-            "alignment": "center",
-            "font_family": "Times New Roman",
-            "size": 10,
-            "color": "#1F3A5F",
-            "bold": False,
-            "italic": False,
-            "separator": False,
-            "separator_color": "#CCCCCC",
-            "show_page_numbers": False,
-            "page_number_position": "header",
-            "page_number_alignment": "center",
-            "page_number_style": "arabic",
-            "page_format": "Page X",
-        },
-        "footer": {
-            "enabled": True,
-            "text": "",
-            "alignment": "center",
-            "font_family": "Times New Roman",
-            "size": 11,
-            "color": "#1F3A5F",
-            "bold": False,
-            "italic": False,
-            "separator": False,
-            "separator_color": "#CCCCCC",
-            "show_page_numbers": True,
-            "page_number_position": "footer",
-            "page_number_alignment": "center",
-            "page_number_style": "arabic",
-            "page_format": "Page X",
+    },
+    "colors": {
+        "h1": "#1F3A5F",
+        "h2": "#2B6CB0",
+        "h3": "#2B6CB0",
+        "h4": "#334155",
+        "h5": "#475569",
+        "h6": "#64748B",
+        "body": "#17202a",
+        "code_background": "#0f172a",
+        "code_text": "#e2e8f0",
+        "table_header_bg": "#f3f4f6",
+        "table_header_text": "#111827",
+        "table_odd_row": "#ffffff",
+        "table_even_row": "#f8fafc",
+        "table_border": "#d1d5db",
+        "link": "#2563eb",
+    },
+    "spacing": {
+        "line_spacing": 1.5,
+        "tab_width": 4,
+        "paragraph_spacing_before": 0,
+        "paragraph_spacing_after": 6,
+        "heading_spacing_before": 10,
+        "heading_spacing_after": 6,
+        "paragraph_first_line_indent": 0,
+        "bullet_base_indent": 0.25,
+        "bullet_indent_per_level": 0.45,
+        "code_indent": 0,
+        "quote_indent": 0.5,
+        "paragraph_alignment": "left",
+    },
+    "page": {
+        "size": "A4",
+        "orientation": "portrait",
+        "margins": {"top": 1.0, "bottom": 1.0, "left": 1.0, "right": 1.0},
+        "border": {
+            "enabled": False,
+            "width": 1,
+            "color": "#000000",
+            "style": "single",
+            "offset": 24,
+            "shadow": False,
+            "frame": False,
         },
+    },
+    "header": {
+        "enabled": True,
+        "text": "",
+        "alignment": "center",
+        "font_family": "Times New Roman",
+        "size": 10,
+        "color": "#1F3A5F",
+        "bold": False,
+        "italic": False,
+        "separator": False,
+        "separator_color": "#CCCCCC",
+        "show_page_numbers": False,
+        "page_number_position": "header",
+        "page_number_alignment": "center",
+        "page_number_style": "arabic",
+        "page_format": "Page X",
+    },
+    "footer": {
+        "enabled": True,
+        "text": "",
+        "alignment": "center",
+        "font_family": "Times New Roman",
+        "size": 11,
+        "color": "#1F3A5F",
+        "bold": False,
+        "italic": False,
+        "separator": False,
+        "separator_color": "#CCCCCC",
+        "show_page_numbers": True,
+        "page_number_position": "footer",
+        "page_number_alignment": "center",
+        "page_number_style": "arabic",
+        "page_format": "Page X",
+    },
+}
+DEFAULT_CONFIG_VIEW: Mapping[str, Any] = MappingProxyType(_DEFAULT_CONFIG)
+_DEFAULT_CONFIG_JSON = _json_dumps(_DEFAULT_CONFIG)
+
+
+def _default_config() -> Dict[str, Any]:
+    # Sections only hold scalars and scalar sub-dicts, so two levels of dict() copies isolate callers.
+    return {
+        section: {key: dict(value) if isinstance(value, dict) else value for key, value in values.items()}
+        for section, values in _DEFAULT_CONFIG.items()
     }
 
 
@@ -891,7 +985,11 @@ def _theme_record_from_config(theme_key: str, name: str, description: str, confi
 
 
 def _apply_theme_to_config(config: Mapping[str, Any], theme_key: str, theme: Mapping[str, Any]) -> Dict[str, Any]:
-    merged = _deep_merge(_default_config(), config)
+    if config is DEFAULT_CONFIG_VIEW:
+        # The defaults merged onto themselves are just the defaults; one copy keeps the view untouched.
+        merged = _default_config()
+    else:
+        merged = _deep_merge(_default_config(), config)
     app_section = _as_dict(merged.get("app"))
     app_section["theme"] = theme_key
     merged["app"] = app_section
@@ -902,24 +1000,40 @@ def _apply_theme_to_config(config: Mapping[str, Any], theme_key: str, theme: Map
     return merged
 
 
-def _set_by_path(root: MutableMapping[str, Any], path: str, value: Any) -> None:
-    if not re.fullmatch(r"[A-Za-z0-9_.-]+", path or ""):
+_CONFIG_PATH_RE = re.compile(r"[A-Za-z0-9_.-]+")
+_LINE_SPACING_PATHS = frozenset({"spacing.line_spacing", "styles.line_spacing"})
+_TAB_WIDTH_PATHS = frozenset({"spacing.tab_width", "styles.tab_width"})
+
+
+@lru_cache(maxsize=512)
+def _split_config_path(path: str) -> tuple[str, ...]:
+    if not _CONFIG_PATH_RE.fullmatch(path):
         raise ValueError("Invalid config path")
+    if "." not in path:
+        return (path,)
     if ".." in path or path.startswith("."):
         raise ValueError("Invalid config path")
-
-    keys = [k for k in path.split(".") if k]
+    keys = tuple(k for k in path.split(".") if k)
     if not keys:
         raise ValueError("Invalid config path")
+    return keys
+
+
+def _set_by_path(root: MutableMapping[str, Any], path: str, value: Any) -> None:
+    keys = _split_config_path(path or "")
+    if len(keys) == 1:
+        root[keys[0]] = value
+        return
     cursor: MutableMapping[str, Any] = root
     for key in keys[:-1]:
         current = cursor.get(key)
-        if not isinstance(current, dict):
-            cursor[key] = {}
-        cursor = cursor[key]
-    if path.lower() in {"spacing.line_spacing", "styles.line_spacing"}:
+        current = dict(current) if isinstance(current, dict) else {}
+        cursor[key] = current
+        cursor = current
+    lowered = path.lower()
+    if lowered in _LINE_SPACING_PATHS:
         cursor[keys[-1]] = _normalize_line_spacing(value, default=1.5)
-    elif path.lower() in {"spacing.tab_width", "styles.tab_width"}:
+    elif lowered in _TAB_WIDTH_PATHS:
         cursor[keys[-1]] = _normalize_tab_width(value, default=4)
     else:
         cursor[keys[-1]] = value
@@ -931,8 +1045,7 @@ def _infer_page_mode(page_format: Any) -> str:
 
 
 def _theme_to_payload(theme_key: str, theme: Mapping[str, Any]) -> ThemePayload:
-    cfg = _default_config()
-    merged = _apply_theme_to_config(cfg, theme_key, theme)
+    merged = _apply_theme_to_config(DEFAULT_CONFIG_VIEW, theme_key, theme)
     fonts = _as_dict(merged.get("fonts"))
     colors = _as_dict(merged.get("colors"))
     spacing = _as_dict(merged.get("spacing"))
@@ -1102,7 +1215,7 @@ def _compose_security_payload(
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadTokenRecord:
     file_id: str
     filename: str
@@ -1110,7 +1223,7 @@ class DownloadTokenRecord:
     remaining_uses: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportJobRecord:
     job_id: str
     requested_format: str
@@ -1151,14 +1264,28 @@ class FixedWindowRateLimiter:
             return True, 0
 
 
+_MERGED_THEME_CACHE_SIZE = 64
+_PREVIEW_CACHE_SIZE = 32
+_PARSE_CACHE_SIZE = 16
+
+
 class AppState:
     def __init__(self) -> None:
         self.lock = RLock()
         self.config_path = CANONICAL_CONFIG_PATH
         self.themes_path = CANONICAL_THEMES_PATH
         self.prompt_path = PROMPT_PATH
-        self.config = self._bootstrap_config()
-        self.theme_catalog = self._bootstrap_themes()
+        self._pending_saves: Set[str] = set()
+        self._batch_depth = 0
+        self._theme_payload_cache: Dict[str, ThemePayload] = {}
+        self._merged_theme_cache: OrderedDict[tuple[str, bytes], ThemePayload] = OrderedDict()
+        self._preview_cache: OrderedDict[bytes, PreviewResponse] = OrderedDict()
+        self._parse_cache: OrderedDict[tuple[bytes, int], ParseResult] = OrderedDict()
+        self._themes_body: bytes | None = None
+        self._config_body: bytes | None = None
+        with self.batch_saves():
+            self.config = self._bootstrap_config()
+            self.theme_catalog = self._bootstrap_themes()
         self._ensure_prompt_file()
         self.generated_filenames: Dict[str, str] = {}
         self.download_tokens: Dict[str, DownloadTokenRecord] = {}
@@ -1183,7 +1310,7 @@ class AppState:
         if self.config_path.exists():
             raw = _read_json_dict(self.config_path)
             config = _normalize_config_payload(raw)
-            _write_json(self.config_path, config)
+            self._pending_saves.add("config")
             return config
 
         for legacy in LEGACY_CONFIG_PATHS:
@@ -1191,12 +1318,12 @@ class AppState:
             if raw is None:
                 continue
             config = _normalize_config_payload(raw)
-            _write_json(self.config_path, config)
+            self._pending_saves.add("config")
             logger.info("Migrated config data from %s -> %s", legacy.name, self.config_path.name)
             return config
 
         config = _default_config()
-        _write_json(self.config_path, config)
+        self._pending_saves.add("config")
         return config
 
     def _bootstrap_themes(self) -> Dict[str, Dict[str, Any]]:
@@ -1233,9 +1360,9 @@ class AppState:
             current = next(iter(theme_map.keys()))
             app_cfg["theme"] = current
             self.config["app"] = app_cfg
-            _write_json(self.config_path, self.config)
+            self._pending_saves.add("config")
 
-        _write_json(self.themes_path, {"themes": theme_map})
+        self._pending_saves.add("themes")
         return theme_map
 
     def _ensure_prompt_file(self) -> None:
@@ -1243,11 +1370,118 @@ class AppState:
             return
         self.prompt_path.write_text(DEFAULT_PROMPT, encoding="utf-8")
 
+    @contextmanager
+    def batch_saves(self) -> Iterator[None]:
+        with self.lock:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        # A save only leaves the pending set once written, so a failed write is retried on the next flush.
+        with self.lock:
+            if "config" in self._pending_saves:
+                encoded = _DEFAULT_CONFIG_JSON if self.config == _DEFAULT_CONFIG else None
+                _write_json(self.config_path, self.config, encoded=encoded)
+                self._pending_saves.discard("config")
+            if "themes" in self._pending_saves:
+                _write_json(self.themes_path, {"themes": self.theme_catalog}, compact=True)
+                self._pending_saves.discard("themes")
+
+    def _mark_dirty(self, name: str) -> None:
+        with self.lock:
+            self._pending_saves.add(name)
+            if self._batch_depth == 0:
+                self.flush()
+
     def save_config(self) -> None:
-        _write_json(self.config_path, self.config)
+        self._preview_cache.clear()
+        self._themes_body = None
+        self._config_body = None
+        self._mark_dirty("config")
 
     def save_themes(self) -> None:
-        _write_json(self.themes_path, {"themes": self.theme_catalog})
+        self._theme_payload_cache.clear()
+        self._merged_theme_cache.clear()
+        self._preview_cache.clear()
+        self._themes_body = None
+        self._mark_dirty("themes")
+
+    def theme_payload(self, theme_key: str) -> ThemePayload:
+        with self.lock:
+            cached = self._theme_payload_cache.get(theme_key)
+            if cached is None:
+                cached = _theme_to_payload(theme_key, self.theme_catalog.get(theme_key, {}))
+                self._theme_payload_cache[theme_key] = cached
+            return cached
+
+    def merged_theme_payload(self, theme_key: str, request_theme: ThemePayload) -> ThemePayload:
+        if not request_theme.model_fields_set:
+            return self.theme_payload(theme_key)
+        # The editor resends the same theme with every preview; key on its content.
+        encoded = request_theme.model_dump_json(exclude_unset=True).encode("utf-8")
+        cache_key = (theme_key, hashlib.blake2b(encoded, digest_size=16).digest())
+        with self.lock:
+            cached = self._merged_theme_cache.get(cache_key)
+            if cached is not None:
+                self._merged_theme_cache.move_to_end(cache_key)
+                return cached
+            merged = _merge_theme_payload(self.theme_payload(theme_key), request_theme)
+            self._merged_theme_cache[cache_key] = merged
+            while len(self._merged_theme_cache) > _MERGED_THEME_CACHE_SIZE:
+                self._merged_theme_cache.popitem(last=False)
+            return merged
+
+    def parse(self, content: str, *, tab_width: int) -> ParseResult:
+        # Preview and generate usually arrive back to back with the same content.
+        digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cache_key = (digest, tab_width)
+        with self.lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+                return cached
+        parsed = parse_notesforge(content, tab_width=tab_width)
+        with self.lock:
+            self._parse_cache[cache_key] = parsed
+            while len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return parsed
+
+    def cached_preview(self, digest: bytes) -> PreviewResponse | None:
+        with self.lock:
+            cached = self._preview_cache.get(digest)
+            if cached is not None:
+                self._preview_cache.move_to_end(digest)
+            return cached
+
+    def remember_preview(self, digest: bytes, response: PreviewResponse) -> None:
+        with self.lock:
+            self._preview_cache[digest] = response
+            while len(self._preview_cache) > _PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
+
+    def themes_body(self) -> bytes:
+        # The catalog only changes through save_themes/save_config, so /api/themes serves a pre-encoded snapshot.
+        with self.lock:
+            if self._themes_body is None:
+                current = self.current_theme_key()
+                self._themes_body = _json_dumps(
+                    {"success": True, "themes": self.theme_catalog, "current_theme": current},
+                    compact=True,
+                )
+            return self._themes_body
+
+    def config_body(self) -> bytes:
+        # Every config change goes through save_config, which drops this snapshot.
+        with self.lock:
+            if self._config_body is None:
+                self._config_body = _json_dumps({"success": True, "config": self.config}, compact=True)
+            return self._config_body
 
     def current_theme_key(self) -> str:
         app_cfg = _as_dict(self.config.get("app"))
@@ -1372,8 +1606,7 @@ def _build_theme_and_security(
     with state.lock:
         theme_key = state.current_theme_key()
         theme_record = state.theme_catalog.get(theme_key, {})
-        base_theme = _theme_to_payload(theme_key, theme_record)
-        merged_theme = _merge_theme_payload(base_theme, incoming_theme)
+        merged_theme = state.merged_theme_payload(theme_key, incoming_theme)
         merged_security = _compose_security_payload(incoming_security, state.config, theme_record)
         return merged_theme, merged_security, theme_key
 
@@ -1387,77 +1620,92 @@ def _normalize_tab_width(value: Any, default: int = 4) -> int:
 
 
 def _indent_columns(line: str, *, tab_width: int) -> int:
-    expanded = line.replace("\t", " " * _normalize_tab_width(tab_width))
-    return len(expanded) - len(expanded.lstrip(" "))
+    if not line or line[0] not in " \t":
+        return 0
+    lead = len(line) - len(line.lstrip(" \t"))
+    return lead + line.count("\t", 0, lead) * (_normalize_tab_width(tab_width) - 1)
+
+
+_MARKER_LINE_TYPES: Dict[str, str] = {
+    "H1": "heading",
+    "H2": "heading",
+    "H3": "heading",
+    "H4": "heading",
+    "H5": "heading",
+    "H6": "heading",
+    "PARAGRAPH": "paragraph",
+    "CENTER": "paragraph",
+    "RIGHT": "paragraph",
+    "JUSTIFY": "paragraph",
+    "TOC": "toc",
+    "LIST_OF_TABLES": "list_of_tables",
+    "LIST_OF_FIGURES": "list_of_figures",
+    "COVER_PAGE": "section",
+    "CERTIFICATE_PAGE": "section",
+    "DECLARATION_PAGE": "section",
+    "ACKNOWLEDGEMENT_PAGE": "section",
+    "ABSTRACT_PAGE": "section",
+    "CHAPTER": "chapter",
+    "APPENDIX": "appendix",
+    "REFERENCES": "references",
+    "REFERENCE": "reference",
+    "BULLET": "bullet",
+    "NUMBERED": "numbered",
+    "TABLE": "table",
+    "TABLE_CAPTION": "table_caption",
+    "FIGURE_CAPTION": "figure_caption",
+    "FIGURE": "figure",
+    "IMAGE": "image",
+    "CODE": "code",
+    "ASCII": "ascii",
+    "DIAGRAM": "ascii",
+    "PAGEBREAK": "pagebreak",
+    "LABEL": "paragraph",
+    "TIP": "paragraph",
+    "WARNING": "paragraph",
+    "INFO": "paragraph",
+    "SUCCESS": "paragraph",
+    "CALLOUT": "paragraph",
+    "SUMMARY": "paragraph",
+    "EQUATION": "code",
+    "CHECKLIST": "bullet",
+    "SEPARATOR": "separator",
+}
 
 
-def _classify_line(line: str, *, tab_width: int = 4) -> Dict[str, Any]:
-    stripped = line.rstrip("\n")
-    if not stripped.strip():
-        return {"type": "empty", "content": "", "marker": None, "indent_level": 0}
+def _classify_line(line: str, *, tab_width: int = 4, line_number: int = 0) -> Dict[str, Any]:
+    # Built complete in one literal; /api/analyze returns these dicts as-is.
+    if not line or line.isspace():
+        return {
+            "type": "empty",
+            "content": "",
+            "marker": None,
+            "indent_level": 0,
+            "line_number": line_number,
+            "original": line,
+        }
 
-    marker_match = MARKER_REGEX.match(line)
+    marker_match = split_marker_line(line)
     if marker_match:
-        marker = normalize_marker(marker_match.group(1).upper())
-        raw_payload = marker_match.group(2).rstrip()
+        marker = normalize_marker(marker_match[0])
+        raw_payload = marker_match[1].rstrip()
         payload = raw_payload[1:] if raw_payload.startswith(" ") else raw_payload
-        marker_type_map = {
-            "H1": "heading",
-            "H2": "heading",
-            "H3": "heading",
-            "H4": "heading",
-            "H5": "heading",
-            "H6": "heading",
-            "PARAGRAPH": "paragraph",
-            "CENTER": "paragraph",
-            "RIGHT": "paragraph",
-            "JUSTIFY": "paragraph",
-            "TOC": "toc",
-            "LIST_OF_TABLES": "list_of_tables",
-            "LIST_OF_FIGURES": "list_of_figures",
-            "COVER_PAGE": "section",
-            "CERTIFICATE_PAGE": "section",
-            "DECLARATION_PAGE": "section",
-            "ACKNOWLEDGEMENT_PAGE": "section",
-            "ABSTRACT_PAGE": "section",
-            "CHAPTER": "chapter",
-            "APPENDIX": "appendix",
-            "REFERENCES": "references",
-            "REFERENCE": "reference",
-            "BULLET": "bullet",
-            "NUMBERED": "numbered",
-            "TABLE": "table",
-            "TABLE_CAPTION": "table_caption",
-            "FIGURE_CAPTION": "figure_caption",
-            "FIGURE": "figure",
-            "IMAGE": "image",
-            "CODE": "code",
-            "ASCII": "ascii",
-            "DIAGRAM": "ascii",
-            "PAGEBREAK": "pagebreak",
-            "LABEL": "paragraph",
-            "TIP": "paragraph",
-            "WARNING": "paragraph",
-            "INFO": "paragraph",
-            "SUCCESS": "paragraph",
-            "CALLOUT": "paragraph",
-            "SUMMARY": "paragraph",
-            "EQUATION": "code",
-            "CHECKLIST": "bullet",
-            "SEPARATOR": "separator",
-        }
         return {
-            "type": marker_type_map.get(marker, marker.lower()),
+            "type": _MARKER_LINE_TYPES.get(marker) or marker.lower(),
             "content": payload,
             "marker": marker,
             "indent_level": _indent_columns(line, tab_width=tab_width),
+            "line_number": line_number,
+            "original": line,
         }
 
     return {
         "type": "paragraph",
-        "content": stripped.rstrip(),
+        "content": line.rstrip(),
         "marker": None,
         "indent_level": _indent_columns(line, tab_width=tab_width),
+        "line_number": line_number,
+        "original": line,
     }
 
 
@@ -1486,20 +1734,20 @@ def _prepare_export(
         raise HTTPException(status_code=400, detail=f"Unsupported format: {target_format}")
 
     merged_theme, merged_security, _ = _build_theme_and_security(state, req.theme, req.security)
-    parsed = parse_notesforge(req.content, tab_width=_theme_tab_width(merged_theme))
+    parsed = state.parse(req.content, tab_width=_theme_tab_width(merged_theme))
     formatting = FormattingOptions(
         margins=merged_theme.margins,
         lineSpacing=_normalize_line_spacing(merged_theme.bodyStyle.lineHeight or 1.5, default=1.5),
     )
+    # Inputs are snapshotted above; FileStore and the local PDF converters (docx2pdf, soffice) lock themselves.
     try:
-        with state.lock:
-            export_result = state.exporter.create_export_file(
-                target_format=target_format,
-                nodes=parsed.nodes,
-                theme=merged_theme,
-                formatting=formatting,
-                security=merged_security,
-            )
+        export_result = state.exporter.create_export_file(
+            target_format=target_format,
+            nodes=parsed.nodes,
+            theme=merged_theme,
+            formatting=formatting,
+            security=merged_security,
+        )
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc))
     if not export_result.output_path.exists():
@@ -1668,10 +1916,35 @@ def _run_batch_processing_job(
                 continue
 
 
+_STORE_CLEANUP_INTERVAL_SECONDS = 60
+_FILE_ID_RE = re.compile(r"[0-9a-fA-F]{32}")
+
+
+async def _periodic_store_cleanup(store: FileStore) -> None:
+    while True:
+        await asyncio.sleep(_STORE_CLEANUP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(store.cleanup)
+        except Exception:
+            logger.exception("Export cleanup failed")
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="NotesForge API", version=APP_VERSION)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
     state = AppState()
 
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        cleanup_task = asyncio.create_task(_periodic_store_cleanup(state.store))
+        try:
+            yield
+        finally:
+            cleanup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await cleanup_task
+
+    app = FastAPI(title="NotesForge API", version=APP_VERSION, lifespan=lifespan)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=_allowed_origins(),
@@ -1750,26 +2023,36 @@ def create_app() -> FastAPI:
         with state.lock:
             tab_width = _normalize_tab_width(_as_dict(state.config.get("spacing")).get("tab_width"), default=4)
 
-        lines = content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
         classifications: List[Dict[str, Any]] = []
         stats: Dict[str, int] = {}
-        for idx, line in enumerate(lines, start=1):
-            classified = _classify_line(line, tab_width=tab_width)
-            classified["line_number"] = idx
-            classified["original"] = line
-            stats[classified["type"]] = stats.get(classified["type"], 0) + 1
+        for idx, line in enumerate(content.split("\n"), start=1):
+            classified = _classify_line(line, tab_width=tab_width, line_number=idx)
+            line_type = classified["type"]
+            stats[line_type] = stats.get(line_type, 0) + 1
             classifications.append(classified)
 
-        return {
-            "success": True,
-            "total_lines": len(lines),
-            "statistics": stats,
-            "classifications": classifications,
-            "preview": classifications[:20],
-        }
+        # Rows are plain str/int/None dicts; skip jsonable_encoder's per-row walk.
+        body = _json_dumps(
+            {
+                "success": True,
+                "total_lines": len(classifications),
+                "statistics": stats,
+                "classifications": classifications,
+                "preview": classifications[:20],
+            },
+            compact=True,
+        )
+        return Response(content=body, media_type="application/json")
 
     @app.post("/api/preview", response_model=PreviewResponse)
     async def preview(req: PreviewRequest) -> PreviewResponse:
+        # Editors re-post unchanged content on autosave; config/theme saves clear the cache.
+        digest = hashlib.blake2b(req.model_dump_json().encode("utf-8"), digest_size=16).digest()
+        cached = state.cached_preview(digest)
+        if cached is not None:
+            return cached
         merged_theme, merged_security, _ = _build_theme_and_security(
             state,
             req.theme,
@@ -1780,7 +2063,7 @@ def create_app() -> FastAPI:
                 footerText=req.security.footerText,
             ),
         )
-        parsed = parse_notesforge(req.content, tab_width=_theme_tab_width(merged_theme))
+        parsed = state.parse(req.content, tab_width=_theme_tab_width(merged_theme))
         formatting = FormattingOptions(
             margins=req.formattingOptions.margins,
             lineSpacing=_normalize_line_spacing(
@@ -1794,7 +2077,7 @@ def create_app() -> FastAPI:
             formatting=formatting,
             security=merged_security,
         )
-        return PreviewResponse(
+        response = PreviewResponse(
             previewHtml=preview_html,
             warnings=parsed.warnings,
             structure=StructureSummary(
@@ -1803,10 +2086,12 @@ def create_app() -> FastAPI:
                 readingTimeMinutes=parsed.summary.reading_time_minutes,
             ),
         )
+        state.remember_preview(digest, response)
+        return response
 
     @app.post("/api/generate", response_model=GenerateResponse)
     async def generate(req: GenerateRequest) -> GenerateResponse:
-        export_result, filename = _prepare_export(state, req)
+        export_result, filename = await asyncio.to_thread(_prepare_export, state, req)
         all_warnings = list(export_result.warnings)
         if export_result.warning and export_result.warning not in all_warnings:
             all_warnings.append(export_result.warning)
@@ -1908,7 +2193,7 @@ def create_app() -> FastAPI:
         if token_target:
             resolved_file_id, resolved_name = token_target
         else:
-            if not re.fullmatch(r"[0-9a-fA-F]{32}", key):
+            if not _FILE_ID_RE.fullmatch(key):
                 raise HTTPException(status_code=404, detail="File not found")
             resolved_file_id = key.lower()
             with state.lock:
@@ -1958,14 +2243,16 @@ def create_app() -> FastAPI:
                     detail="Provide an uploaded file or choose a detected file from the runtime directories",
                 )
 
+            # Like the batch worker, convert off the event loop and without holding state.lock.
+            result = await asyncio.to_thread(
+                state.pdf_conversion.convert,
+                source_path,
+                target_format=target_format,
+                provider_preference=provider_preference,
+                preserve_layout=preserve_layout,
+                output_basename=output_basename,
+            )
             with state.lock:
-                result = state.pdf_conversion.convert(
-                    source_path,
-                    target_format=target_format,
-                    provider_preference=provider_preference,
-                    preserve_layout=preserve_layout,
-                    output_basename=output_basename,
-                )
                 state.remember_file_name(result.file_id, result.output_filename)
                 state.cleanup_tokens()
                 token = state.issue_download_token(result.file_id, result.output_filename)
@@ -2067,13 +2354,16 @@ def create_app() -> FastAPI:
 
     @app.get("/api/config")
     async def get_config():
-        with state.lock:
-            return {"success": True, "config": state.config}
+        return Response(content=state.config_body(), media_type="application/json")
 
     @app.post("/api/config/update")
     async def update_config(req: ConfigUpdateRequest):
+        try:
+            _json_dumps({"value": req.value}, compact=True)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Config value cannot be stored as JSON")
         with state.lock:
-            updated = _deep_merge({}, state.config)
+            updated = dict(state.config)
             _set_by_path(updated, req.path, req.value)
             state.config = updated
             state.save_config()
@@ -2081,12 +2371,7 @@ def create_app() -> FastAPI:
 
     @app.get("/api/themes")
     async def get_themes():
-        with state.lock:
-            return {
-                "success": True,
-                "themes": state.theme_catalog,
-                "current_theme": state.current_theme_key(),
-            }
+        return Response(content=state.themes_body(), media_type="application/json")
 
     @app.post("/api/themes/apply")
     async def apply_theme(req: ThemeApplyRequest):
@@ -2112,7 +2397,7 @@ def create_app() -> FastAPI:
     @app.post("/api/themes/delete")
     async def delete_theme(req: ThemeDeleteRequest):
         key = _slugify_key(req.key)
-        with state.lock:
+        with state.batch_saves():
             if key not in state.theme_catalog:
                 raise HTTPException(status_code=404, detail="Theme not found")
             if len(state.theme_catalog) <= 1:
@@ -2167,7 +2452,7 @@ def create_app() -> FastAPI:
             cleaned = (full_path or "").strip().lstrip("/")
             if not cleaned:
                 return FileResponse(frontend_dist / "index.html")
-            if cleaned == "api" or cleaned.startswith("api/") or cleaned == "health" or cleaned.startswith("health/"):
+            if cleaned in {"api", "health"} or cleaned.startswith(("api/", "health/")):
                 raise HTTPException(status_code=404, detail="Not found")
 
             asset_path = _safe_child_path(frontend_dist, cleaned)
@@ -2178,4 +2463,14 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+_APP: FastAPI | None = None
+
+
+def __getattr__(name: str) -> Any:
+    # `app.main:app` is built on first access, so importing helpers from here configures nothing.
+    global _APP
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _APP is None:
+        _APP = create_app()
+    return _APP
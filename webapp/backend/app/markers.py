@@ -433,12 +433,52 @@ def _build_alias_map(specs: Iterable[MarkerSpec]) -> Dict[str, str]:
 
 MARKER_ALIAS_MAP: Dict[str, str] = _build_alias_map(MARKER_SPECS)
 MARKER_NAMES: Tuple[str, ...] = tuple(sorted(MARKER_ALIAS_MAP.keys(), key=len, reverse=True))
+
+
+def _trie_pattern(names: Iterable[str]) -> str:
+    # Fold the names into a prefix trie so the regex branches on one character at a
+    # time instead of retrying every alternative from the start of the line.
+    trie: Dict[str, Any] = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+
 MARKER_REGEX = re.compile(
-    r"^\s*(" + "|".join(re.escape(name) for name in MARKER_NAMES) + r")\s*:(.*)$",
+    r"^\s*(" + _trie_pattern(MARKER_NAMES) + r")\s*:(.*)$",
     re.IGNORECASE,
 )
 
 
+def split_marker_line(line: str) -> Tuple[str, str] | None:
+    # Marker names never contain ":", so the first colon ends the name; this is
+    # MARKER_REGEX.match without the regex engine for the common ASCII case.
+    colon = line.find(":")
+    if colon <= 0:
+        return None
+    name = line[:colon].strip()
+    if not name.isascii():
+        match = MARKER_REGEX.match(line)
+        return (match.group(1).upper(), match.group(2)) if match else None
+    name = name.upper()
+    if name not in MARKER_ALIAS_MAP:
+        return None
+    return name, line[colon + 1 :]
+
+
 def normalize_marker(marker: str) -> str:
     if not marker:
         return ""
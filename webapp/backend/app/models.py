@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -114,6 +115,10 @@ class PreviewResponse(BaseModel):
     structure: StructureSummary
 
 
+# \w matches exactly the characters str.isalnum() accepts, plus "_".
+_FILENAME_STRIP_RE = re.compile(r"[^\w\- ]+")
+
+
 class GenerateRequest(BaseModel):
     content: str = Field(..., min_length=1, max_length=MAX_CONTENT_LENGTH)
     theme: ThemePayload = Field(default_factory=ThemePayload)
@@ -125,7 +130,7 @@ class GenerateRequest(BaseModel):
     @field_validator("filename")
     @classmethod
     def validate_filename(cls, value: str) -> str:
-        cleaned = "".join(ch for ch in value if ch.isalnum() or ch in ("_", "-", " "))
+        cleaned = _FILENAME_STRIP_RE.sub("", value)
         cleaned = cleaned.strip().replace(" ", "_")
         return cleaned[:120] if cleaned else "notesforge_output"
 
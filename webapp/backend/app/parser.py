@@ -5,10 +5,7 @@ from html import escape
 import re
 from typing import List, Sequence, Tuple
 
-from .markers import MARKER_REGEX, normalize_marker
-
-
-MARKER_RE = MARKER_REGEX
+from .markers import normalize_marker, split_marker_line
 
 
 FRONT_MATTER_MARKERS = {
@@ -19,8 +16,31 @@ FRONT_MATTER_MARKERS = {
     "ABSTRACT_PAGE": "Abstract",
 }
 
+HEADING_MARKER_LEVELS = {"H1": 1, "H2": 2, "H3": 3, "H4": 4, "H5": 5, "H6": 6}
+
+PARAGRAPH_MARKER_ALIGNS = {
+    "PARAGRAPH": "left",
+    "CENTER": "center",
+    "RIGHT": "right",
+    "JUSTIFY": "justify",
+    "QUOTE": "left",
+    "NOTE": "left",
+    "IMPORTANT": "left",
+    "TIP": "left",
+    "WARNING": "left",
+    "INFO": "left",
+    "SUCCESS": "left",
+    "CALLOUT": "left",
+    "SUMMARY": "left",
+    "LINK": "left",
+    "HIGHLIGHT": "left",
+    "FOOTNOTE": "left",
+    "LABEL": "left",
+}
+PLAIN_PARAGRAPH_MARKERS = frozenset({"PARAGRAPH", "CENTER", "RIGHT", "JUSTIFY"})
+
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     type: str
     text: str = ""
@@ -37,21 +57,21 @@ class Node:
     marker: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class StructureSummary:
     word_count: int
     heading_count: int
     reading_time_minutes: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     nodes: List[Node]
     warnings: List[str]
     summary: StructureSummary
 
 
-@dataclass
+@dataclass(slots=True)
 class _CaptionState:
     chapter_idx: int = 0
     figure_global: int = 0
@@ -66,10 +86,6 @@ class ParseOptions:
     list_indent_unit: int = 2
 
 
-def _is_marker_line(line: str) -> bool:
-    return bool(MARKER_RE.match(line))
-
-
 def _split_table_row(row: str) -> List[str]:
     cleaned = row.strip().strip("|")
     return [col.strip() for col in cleaned.split("|")] if cleaned else []
@@ -80,25 +96,32 @@ def _effective_tab_width(tab_width: int) -> int:
 
 
 def _list_level(raw: str, *, tab_width: int = 4, unit: int = 2) -> int:
-    expanded = raw.replace("\t", " " * _effective_tab_width(tab_width))
-    spaces = len(expanded) - len(expanded.lstrip(" "))
+    if not raw or raw[0] not in " \t":
+        return 0
+    lead = len(raw) - len(raw.lstrip(" \t"))
+    spaces = lead + raw.count("\t", 0, lead) * (_effective_tab_width(tab_width) - 1)
     return max(0, spaces // max(1, unit))
 
 
+_BULLET_PREFIX_RE = re.compile(r"^[-*]\s*")
+_NUMBERED_PREFIX_RE = re.compile(r"^\d+[.)]\s*")
+_CHECKBOX_RE = re.compile(r"^\[(x|X| )\]\s*(.*)$")
+
+
 def _parse_list_item(raw: str, numbered: bool, *, options: ParseOptions) -> tuple[str, int]:
     level = _list_level(raw, tab_width=options.tab_width, unit=options.list_indent_unit)
     stripped = raw.lstrip()
     if numbered:
-        stripped = re.sub(r"^\d+[.)]\s*", "", stripped)
+        stripped = _NUMBERED_PREFIX_RE.sub("", stripped)
     else:
-        stripped = re.sub(r"^[-*]\s*", "", stripped)
+        stripped = _BULLET_PREFIX_RE.sub("", stripped)
     return stripped.rstrip(), level
 
 
 def _parse_checklist_item(raw: str, *, options: ParseOptions) -> tuple[str, int, bool]:
     level = _list_level(raw, tab_width=options.tab_width, unit=options.list_indent_unit)
-    stripped = re.sub(r"^[-*]\s*", "", raw.lstrip())
-    match = re.match(r"^\[(x|X| )\]\s*(.*)$", stripped)
+    stripped = _BULLET_PREFIX_RE.sub("", raw.lstrip())
+    match = _CHECKBOX_RE.match(stripped)
     if match:
         checked = match.group(1).lower() == "x"
         return match.group(2).rstrip(), level, checked
@@ -112,11 +135,16 @@ def _payload_text(payload_raw: str) -> str:
     return payload_raw
 
 
-def _collect_text_block(lines: Sequence[str], start_idx: int, payload_text: str) -> tuple[str, int]:
+def _collect_text_block(
+    lines: Sequence[str],
+    marker_matches: Sequence[Tuple[str, str] | None],
+    start_idx: int,
+    payload_text: str,
+) -> tuple[str, int]:
     block_lines = [payload_text] if payload_text else []
     next_idx = start_idx + 1
     while next_idx < len(lines):
-        if _is_marker_line(lines[next_idx]):
+        if marker_matches[next_idx] is not None:
             break
         block_lines.append(lines[next_idx].rstrip())
         next_idx += 1
@@ -258,7 +286,11 @@ def _escape_with_breaks(value: str) -> str:
 
 
 def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
-    lines = content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    lines = content.split("\n")
+    # Block collectors stop on the next marker line and the outer loop resumes there, so match each line once.
+    marker_matches = [split_marker_line(line) for line in lines]
     nodes: List[Node] = []
     warnings: List[str] = []
     idx = 0
@@ -271,7 +303,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             idx += 1
             continue
 
-        marker_match = MARKER_RE.match(raw_line)
+        marker_match = marker_matches[idx]
         if not marker_match:
             fallback_text = raw_line.rstrip()
             nodes.append(Node(type="paragraph", text=fallback_text))
@@ -279,42 +311,38 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             idx += 1
             continue
 
-        raw_marker = marker_match.group(1).upper()
+        raw_marker, payload_raw = marker_match
         marker = normalize_marker(raw_marker)
-        payload_raw = marker_match.group(2)
         payload_text = _payload_text(payload_raw.rstrip())
         payload = payload_text.strip()
 
-        if marker == "H1":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
-            nodes.append(Node(type="heading", level=1, text=block_text.strip(), marker=raw_marker))
-            last_caption_target = ""
-            idx = next_idx
-            continue
-
-        if marker == "H2":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
-            nodes.append(Node(type="heading", level=2, text=block_text.strip(), marker=raw_marker))
-            last_caption_target = ""
-            idx = next_idx
-            continue
-
-        if marker == "H3":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
-            nodes.append(Node(type="heading", level=3, text=block_text.strip(), marker=raw_marker))
+        align = PARAGRAPH_MARKER_ALIGNS.get(marker)
+        if align is not None:
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
+            role = "paragraph" if marker in PLAIN_PARAGRAPH_MARKERS else marker.lower()
+            nodes.append(
+                Node(
+                    type="paragraph",
+                    text=block_text,
+                    align=align,
+                    role=role,
+                    marker=raw_marker,
+                )
+            )
             last_caption_target = ""
-            idx = next_idx
+            idx = next_idx if next_idx > idx else idx + 1
             continue
 
-        if marker in {"H4", "H5", "H6"}:
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
-            nodes.append(Node(type="heading", level=int(marker[1:]), text=block_text.strip(), marker=raw_marker))
+        level = HEADING_MARKER_LEVELS.get(marker)
+        if level is not None:
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
+            nodes.append(Node(type="heading", level=level, text=block_text.strip(), marker=raw_marker))
             last_caption_target = ""
             idx = next_idx
             continue
 
         if marker in FRONT_MATTER_MARKERS:
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(
                 Node(
                     type="section",
@@ -328,7 +356,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             continue
 
         if marker == "CHAPTER":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(
                 Node(
                     type="chapter",
@@ -342,7 +370,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             continue
 
         if marker == "APPENDIX":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(
                 Node(
                     type="appendix",
@@ -356,7 +384,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             continue
 
         if marker == "REFERENCES":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(
                 Node(
                     type="references_heading",
@@ -370,7 +398,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             continue
 
         if marker == "REFERENCE":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(Node(type="reference", text=block_text.strip(), role="reference", marker=raw_marker))
             last_caption_target = ""
             idx = next_idx
@@ -409,21 +437,21 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             continue
 
         if marker == "TABLE_CAPTION":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(Node(type="table_caption", text=block_text.strip(), role="table_caption", marker=raw_marker))
             last_caption_target = ""
             idx = next_idx
             continue
 
         if marker == "FIGURE_CAPTION":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             nodes.append(Node(type="figure_caption", text=block_text.strip(), role="figure_caption", marker=raw_marker))
             last_caption_target = ""
             idx = next_idx
             continue
 
         if marker == "CAPTION":
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
+            block_text, next_idx = _collect_text_block(lines, marker_matches, idx, payload_text)
             caption_role = "figure_caption"
             caption_type = "figure_caption"
             if last_caption_target == "table":
@@ -458,59 +486,6 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             idx += 1
             continue
 
-        if marker in {
-            "PARAGRAPH",
-            "CENTER",
-            "RIGHT",
-            "JUSTIFY",
-            "QUOTE",
-            "NOTE",
-            "IMPORTANT",
-            "TIP",
-            "WARNING",
-            "INFO",
-            "SUCCESS",
-            "CALLOUT",
-            "SUMMARY",
-            "LINK",
-            "HIGHLIGHT",
-            "FOOTNOTE",
-            "LABEL",
-        }:
-            block_text, next_idx = _collect_text_block(lines, idx, payload_text)
-            align = {
-                "PARAGRAPH": "left",
-                "CENTER": "center",
-                "RIGHT": "right",
-                "JUSTIFY": "justify",
-                "QUOTE": "left",
-                "NOTE": "left",
-                "IMPORTANT": "left",
-                "TIP": "left",
-                "WARNING": "left",
-                "INFO": "left",
-                "SUCCESS": "left",
-                "CALLOUT": "left",
-                "SUMMARY": "left",
-                "LINK": "left",
-                "HIGHLIGHT": "left",
-                "FOOTNOTE": "left",
-                "LABEL": "left",
-            }[marker]
-            role = marker.lower() if marker not in {"PARAGRAPH", "CENTER", "RIGHT", "JUSTIFY"} else "paragraph"
-            nodes.append(
-                Node(
-                    type="paragraph",
-                    text=block_text,
-                    align=align,
-                    role=role,
-                    marker=raw_marker,
-                )
-            )
-            last_caption_target = ""
-            idx = next_idx if next_idx > idx else idx + 1
-            continue
-
         if marker == "BULLET":
             items: List[str] = []
             levels: List[int] = []
@@ -522,12 +497,12 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             next_idx = idx + 1
             while next_idx < len(lines):
                 nraw = lines[next_idx]
-                marker_line = MARKER_RE.match(nraw)
+                marker_line = marker_matches[next_idx]
                 if marker_line:
-                    next_name = normalize_marker(marker_line.group(1).upper())
+                    next_name = normalize_marker(marker_line[0])
                     if next_name == "BULLET":
                         cleaned, item_level = _parse_list_item(
-                            _payload_text(marker_line.group(2)),
+                            _payload_text(marker_line[1]),
                             numbered=False,
                             options=options,
                         )
@@ -563,12 +538,12 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             next_idx = idx + 1
             while next_idx < len(lines):
                 nraw = lines[next_idx]
-                marker_line = MARKER_RE.match(nraw)
+                marker_line = marker_matches[next_idx]
                 if marker_line:
-                    next_name = normalize_marker(marker_line.group(1).upper())
+                    next_name = normalize_marker(marker_line[0])
                     if next_name == "NUMBERED":
                         cleaned, item_level = _parse_list_item(
-                            _payload_text(marker_line.group(2)),
+                            _payload_text(marker_line[1]),
                             numbered=True,
                             options=options,
                         )
@@ -605,12 +580,12 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             next_idx = idx + 1
             while next_idx < len(lines):
                 nraw = lines[next_idx]
-                marker_line = MARKER_RE.match(nraw)
+                marker_line = marker_matches[next_idx]
                 if marker_line:
-                    next_name = normalize_marker(marker_line.group(1).upper())
+                    next_name = normalize_marker(marker_line[0])
                     if next_name == "CHECKLIST":
                         cleaned, item_level, checked = _parse_checklist_item(
-                            _payload_text(marker_line.group(2)),
+                            _payload_text(marker_line[1]),
                             options=options,
                         )
                         if cleaned.strip():
@@ -640,7 +615,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             code_lines = [payload_text] if payload_text else []
             next_idx = idx + 1
             while next_idx < len(lines):
-                if _is_marker_line(lines[next_idx]):
+                if marker_matches[next_idx] is not None:
                     break
                 code_lines.append(lines[next_idx])
                 next_idx += 1
@@ -654,7 +629,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             eq_lines = [payload_text] if payload_text else []
             next_idx = idx + 1
             while next_idx < len(lines):
-                if _is_marker_line(lines[next_idx]):
+                if marker_matches[next_idx] is not None:
                     break
                 eq_lines.append(lines[next_idx])
                 next_idx += 1
@@ -669,7 +644,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
             next_idx = idx + 1
             while next_idx < len(lines):
                 candidate = lines[next_idx]
-                if _is_marker_line(candidate):
+                if marker_matches[next_idx] is not None:
                     break
                 ascii_lines.append(candidate.rstrip())
                 next_idx += 1
@@ -680,23 +655,27 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
 
         if marker == "TABLE":
             rows: List[List[str]] = []
+            max_cols = 0
             if payload:
                 row = _split_table_row(payload)
                 if row:
                     rows.append(row)
+                    max_cols = len(row)
 
             next_idx = idx + 1
             while next_idx < len(lines):
                 nraw = lines[next_idx]
                 nline = nraw.strip()
-                next_marker = MARKER_RE.match(nraw)
+                next_marker = marker_matches[next_idx]
                 if next_marker:
-                    next_name = normalize_marker(next_marker.group(1).upper())
+                    next_name = normalize_marker(next_marker[0])
                     if next_name == "TABLE":
-                        next_payload = _payload_text(next_marker.group(2)).strip()
+                        next_payload = _payload_text(next_marker[1]).strip()
                         next_row = _split_table_row(next_payload)
                         if next_row:
                             rows.append(next_row)
+                            if len(next_row) > max_cols:
+                                max_cols = len(next_row)
                         else:
                             warnings.append(f"Line {next_idx + 1}: TABLE row is empty.")
                         next_idx += 1
@@ -709,14 +688,17 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
                     split = _split_table_row(nline)
                     if split:
                         rows.append(split)
+                        if len(split) > max_cols:
+                            max_cols = len(split)
                 else:
                     warnings.append(f"Line {next_idx + 1}: ignored invalid TABLE row.")
                 next_idx += 1
             if not rows:
                 warnings.append(f"Line {idx + 1}: TABLE has no rows.")
             else:
-                max_cols = max(len(row) for row in rows)
-                rows = [row + [""] * (max_cols - len(row)) for row in rows]
+                for row in rows:
+                    if len(row) < max_cols:
+                        row.extend([""] * (max_cols - len(row)))
             nodes.append(Node(type="table", rows=rows, marker=raw_marker))
             last_caption_target = "table"
             idx = next_idx
@@ -760,7 +742,7 @@ def parse_notesforge(content: str, *, tab_width: int = 4) -> ParseResult:
         if node.rows:
             for row in node.rows:
                 all_text_parts.extend(row)
-    word_count = len(" ".join(all_text_parts).split())
+    word_count = sum(len(part.split()) for part in all_text_parts)
     reading_time = round(word_count / 200.0, 2)
 
     return ParseResult(
@@ -785,19 +767,20 @@ def render_preview_html(
     toc_entries = _collect_toc_entries(nodes)
 
     for node in nodes:
-        if node.type == "heading":
+        node_type = node.type
+        if node_type == "heading":
             level = max(1, min(6, node.level))
             fragments.append(f"<h{level}>{_escape_with_breaks(node.text)}</h{level}>")
-        elif node.type in {"section", "chapter", "appendix", "references_heading"}:
-            if node.type == "chapter":
+        elif node_type in {"section", "chapter", "appendix", "references_heading"}:
+            if node_type == "chapter":
                 caption_state.chapter_idx += 1
                 caption_state.figure_chapter = 0
                 caption_state.table_chapter = 0
-            title = node.text or node.type.replace("_", " ").title()
-            if node.type == "chapter":
+            title = node.text or node_type.replace("_", " ").title()
+            if node_type == "chapter":
                 title = f"CHAPTER {caption_state.chapter_idx}: {title}"
             fragments.append(f"<h1>{_escape_with_breaks(title)}</h1>")
-        elif node.type == "toc":
+        elif node_type == "toc":
             fragments.append(f"<h2>{escape(node.text or 'Table of Contents')}</h2>")
             fragments.append('<ul class="nf-list-root nf-toc-list">')
             for level, item in toc_entries or [(1, "TOC entries appear as headings are added.")]:
@@ -806,21 +789,21 @@ def render_preview_html(
                     f'<li class="nf-list-item" style="--nf-level:{indent_level}">{escape(item)}</li>'
                 )
             fragments.append("</ul>")
-        elif node.type == "list_of_tables":
+        elif node_type == "list_of_tables":
             fragments.append(f"<h2>{escape(node.text or 'List of Tables')}</h2>")
             fragments.append('<ul class="nf-list-root">')
             for item in tables or ["Table entries are generated during export."]:
                 fragments.append(f'<li class="nf-list-item">{escape(item)}</li>')
             fragments.append("</ul>")
-        elif node.type == "list_of_figures":
+        elif node_type == "list_of_figures":
             fragments.append(f"<h2>{escape(node.text or 'List of Figures')}</h2>")
             fragments.append('<ul class="nf-list-root">')
             for item in figures or ["Figure entries are generated during export."]:
                 fragments.append(f'<li class="nf-list-item">{escape(item)}</li>')
             fragments.append("</ul>")
-        elif node.type == "reference":
+        elif node_type == "reference":
             fragments.append(f'<p class="nf-paragraph nf-reference">{_escape_with_breaks(node.text)}</p>')
-        elif node.type == "paragraph":
+        elif node_type == "paragraph":
             classes = ["nf-paragraph"]
             if node.role and node.role != "paragraph":
                 classes.append(f"nf-{escape(node.role)}")
@@ -830,7 +813,7 @@ def render_preview_html(
             fragments.append(
                 f'<p class="{" ".join(classes)}"{style_attr}>{_escape_with_breaks(node.text)}</p>'
             )
-        elif node.type == "bullet":
+        elif node_type == "bullet":
             items = node.items or []
             levels = node.levels or []
             fragments.append('<ul class="nf-list-root">')
@@ -840,7 +823,7 @@ def render_preview_html(
                     f'<li class="nf-list-item" style="--nf-level:{item_level}">{escape(item)}</li>'
                 )
             fragments.append("</ul>")
-        elif node.type == "numbered":
+        elif node_type == "numbered":
             items = node.items or []
             levels = node.levels or []
             labels = _numbered_labels(levels, len(items))
@@ -854,7 +837,7 @@ def render_preview_html(
                     f"<span>{escape(item)}</span></li>"
                 )
             fragments.append("</ol>")
-        elif node.type == "checklist":
+        elif node_type == "checklist":
             items = node.items or []
             levels = node.levels or []
             checks = node.checks or []
@@ -867,13 +850,13 @@ def render_preview_html(
                     f'<li class="nf-list-item nf-checklist-item" style="--nf-level:{item_level}">{symbol} {escape(item)}</li>'
                 )
             fragments.append("</ul>")
-        elif node.type == "code":
+        elif node_type == "code":
             fragments.append(f"<pre><code>{escape(node.text)}</code></pre>")
-        elif node.type == "equation":
+        elif node_type == "equation":
             fragments.append(f'<pre class="nf-equation"><code>{escape(node.text)}</code></pre>')
-        elif node.type == "ascii":
+        elif node_type == "ascii":
             fragments.append(f'<pre class="nf-ascii"><code>{escape(node.text)}</code></pre>')
-        elif node.type == "image" or node.type == "figure":
+        elif node_type == "image" or node_type == "figure":
             align_style = f'text-align:{escape(node.align or "center")};'
             src = escape(node.source, quote=True)
             scale = max(10.0, min(100.0, node.scale or 100.0))
@@ -883,12 +866,12 @@ def render_preview_html(
             else:
                 fragments.append('<div class="nf-image-missing">[Image source missing]</div>')
             caption = (node.caption or "").strip()
-            if node.type == "figure" or caption:
+            if node_type == "figure" or caption:
                 num = _caption_number(caption_state, "figure")
                 text = caption or node.text or node.source or "Image"
                 fragments.append(f'<figcaption class="nf-caption">Figure {escape(num)}: {escape(text)}</figcaption>')
             fragments.append("</figure>")
-        elif node.type == "table":
+        elif node_type == "table":
             rows = node.rows or []
             if rows:
                 header = rows[0]
@@ -903,15 +886,15 @@ def render_preview_html(
                         fragments.append(f"<td>{escape(col)}</td>")
                     fragments.append("</tr>")
                 fragments.append("</tbody></table>")
-        elif node.type == "table_caption":
+        elif node_type == "table_caption":
             num = _caption_number(caption_state, "table")
             fragments.append(f'<p class="nf-caption nf-table-caption">Table {escape(num)}: {escape(node.text)}</p>')
-        elif node.type == "figure_caption":
+        elif node_type == "figure_caption":
             num = _caption_number(caption_state, "figure")
             fragments.append(f'<p class="nf-caption nf-figure-caption">Figure {escape(num)}: {escape(node.text)}</p>')
-        elif node.type == "pagebreak":
+        elif node_type == "pagebreak":
             fragments.append('<div class="nf-page-break" aria-hidden="true"></div>')
-        elif node.type == "separator":
+        elif node_type == "separator":
             fragments.append('<hr class="nf-separator" aria-hidden="true" />')
 
     fragments.append("</div>")
@@ -924,52 +907,53 @@ def to_markdown(nodes: Sequence[Node]) -> str:
     figures, tables = _collect_caption_entries(nodes)
     toc_entries = _collect_toc_entries(nodes)
     for node in nodes:
-        if node.type == "heading":
+        node_type = node.type
+        if node_type == "heading":
             lines.append(f"{'#' * max(1, min(6, node.level))} {_single_line_text(node.text)}")
-        elif node.type == "section":
+        elif node_type == "section":
             lines.append(f"# {_single_line_text(node.text)}")
-        elif node.type == "chapter":
+        elif node_type == "chapter":
             caption_state.chapter_idx += 1
             caption_state.figure_chapter = 0
             caption_state.table_chapter = 0
             lines.append(f"# CHAPTER {caption_state.chapter_idx}: {_single_line_text(node.text)}")
-        elif node.type == "appendix":
+        elif node_type == "appendix":
             lines.append(f"# Appendix: {_single_line_text(node.text)}")
-        elif node.type == "references_heading":
+        elif node_type == "references_heading":
             lines.append(f"## {_single_line_text(node.text)}")
-        elif node.type == "reference":
+        elif node_type == "reference":
             lines.append(f"- {_single_line_text(node.text)}")
-        elif node.type == "toc":
+        elif node_type == "toc":
             lines.append("## Table of Contents")
             for level, item in toc_entries or [(1, "TOC entries appear as headings are added.")]:
                 lines.append(f"{'  ' * max(0, level - 1)}- {item}")
-        elif node.type == "list_of_tables":
+        elif node_type == "list_of_tables":
             lines.append(f"## {node.text or 'List of Tables'}")
             for item in tables or ["Table entries are generated during export."]:
                 lines.append(f"- {item}")
-        elif node.type == "list_of_figures":
+        elif node_type == "list_of_figures":
             lines.append(f"## {node.text or 'List of Figures'}")
             for item in figures or ["Figure entries are generated during export."]:
                 lines.append(f"- {item}")
-        elif node.type == "paragraph":
+        elif node_type == "paragraph":
             lines.append(node.text)
-        elif node.type == "pagebreak":
+        elif node_type == "pagebreak":
             lines.append("---")
-        elif node.type == "separator":
+        elif node_type == "separator":
             lines.append("---")
-        elif node.type == "bullet":
+        elif node_type == "bullet":
             levels = node.levels or []
             for idx, item in enumerate(node.items or []):
                 item_level = levels[idx] if idx < len(levels) else 0
                 lines.append(f"{'  ' * item_level}- {item}")
-        elif node.type == "numbered":
+        elif node_type == "numbered":
             levels = node.levels or []
             labels = _numbered_labels(levels, len(node.items or []))
             for idx, item in enumerate(node.items or []):
                 item_level = levels[idx] if idx < len(levels) else 0
                 item_label = labels[idx] if idx < len(labels) else str(idx + 1)
                 lines.append(f"{'  ' * item_level}{item_label}. {item}")
-        elif node.type == "checklist":
+        elif node_type == "checklist":
             levels = node.levels or []
             checks = node.checks or []
             for idx, item in enumerate(node.items or []):
@@ -977,35 +961,35 @@ def to_markdown(nodes: Sequence[Node]) -> str:
                 checked = checks[idx] if idx < len(checks) else False
                 mark = "x" if checked else " "
                 lines.append(f"{'  ' * item_level}- [{mark}] {item}")
-        elif node.type == "code":
+        elif node_type == "code":
             lines.append("```")
             lines.append(node.text)
             lines.append("```")
-        elif node.type == "equation":
+        elif node_type == "equation":
             lines.append("```text")
             lines.append(node.text)
             lines.append("```")
-        elif node.type == "ascii":
+        elif node_type == "ascii":
             lines.append("```text")
             lines.append(node.text)
             lines.append("```")
-        elif node.type == "image" or node.type == "figure":
+        elif node_type == "image" or node_type == "figure":
             text = _single_line_text(node.caption or node.text or "Image")
             lines.append(f"![{text}]({node.source})")
-            if node.type == "figure" or node.caption:
+            if node_type == "figure" or node.caption:
                 num = _caption_number(caption_state, "figure")
                 lines.append(f"*Figure {num}: {text}*")
-        elif node.type == "table":
+        elif node_type == "table":
             rows = node.rows or []
             if rows:
                 lines.append("| " + " | ".join(rows[0]) + " |")
                 lines.append("| " + " | ".join("---" for _ in rows[0]) + " |")
                 for row in rows[1:]:
                     lines.append("| " + " | ".join(row) + " |")
-        elif node.type == "table_caption":
+        elif node_type == "table_caption":
             num = _caption_number(caption_state, "table")
             lines.append(f"*Table {num}: {_single_line_text(node.text)}*")
-        elif node.type == "figure_caption":
+        elif node_type == "figure_caption":
             num = _caption_number(caption_state, "figure")
             lines.append(f"*Figure {num}: {_single_line_text(node.text)}*")
         lines.append("")
@@ -1018,72 +1002,73 @@ def to_plain_text(nodes: Sequence[Node]) -> str:
     figures, tables = _collect_caption_entries(nodes)
     toc_entries = _collect_toc_entries(nodes)
     for node in nodes:
-        if node.type == "heading":
+        node_type = node.type
+        if node_type == "heading":
             lines.append(node.text)
-        elif node.type == "section":
+        elif node_type == "section":
             lines.append(node.text)
-        elif node.type == "chapter":
+        elif node_type == "chapter":
             caption_state.chapter_idx += 1
             caption_state.figure_chapter = 0
             caption_state.table_chapter = 0
             lines.append(f"CHAPTER {caption_state.chapter_idx}: {node.text}")
-        elif node.type == "appendix":
+        elif node_type == "appendix":
             lines.append(f"Appendix: {node.text}")
-        elif node.type == "references_heading":
+        elif node_type == "references_heading":
             lines.append(node.text)
-        elif node.type == "reference":
+        elif node_type == "reference":
             lines.append(f"- {node.text}")
-        elif node.type == "toc":
+        elif node_type == "toc":
             lines.append("Table of Contents")
             lines.extend(
                 f"{'  ' * max(0, level - 1)}- {entry}"
                 for level, entry in (toc_entries or [(1, "TOC entries appear as headings are added.")])
             )
-        elif node.type == "list_of_tables":
+        elif node_type == "list_of_tables":
             lines.append(node.text or "List of Tables")
             lines.extend(f"- {entry}" for entry in tables)
-        elif node.type == "list_of_figures":
+        elif node_type == "list_of_figures":
             lines.append(node.text or "List of Figures")
             lines.extend(f"- {entry}" for entry in figures)
-        elif node.type == "paragraph":
+        elif node_type == "paragraph":
             lines.append(node.text)
-        elif node.type == "pagebreak":
+        elif node_type == "pagebreak":
             lines.append("")
             lines.append("[PAGE BREAK]")
-        elif node.type == "separator":
+        elif node_type == "separator":
             lines.append("----------")
-        elif node.type == "bullet":
+        elif node_type == "bullet":
             lines.extend(f"- {item}" for item in (node.items or []))
-        elif node.type == "numbered":
+        elif node_type == "numbered":
             levels = node.levels or []
             labels = _numbered_labels(levels, len(node.items or []))
             for idx, item in enumerate(node.items or []):
                 item_level = levels[idx] if idx < len(levels) else 0
                 item_label = labels[idx] if idx < len(labels) else str(idx + 1)
                 lines.append(f"{'  ' * item_level}{item_label}. {item}")
-        elif node.type == "checklist":
+        elif node_type == "checklist":
             checks = node.checks or []
             for idx, item in enumerate(node.items or []):
                 checked = checks[idx] if idx < len(checks) else False
                 lines.append(f"[{'x' if checked else ' '}] {item}")
-        elif node.type == "code":
+        elif node_type == "code":
             lines.append(node.text)
-        elif node.type == "equation":
+        elif node_type == "equation":
             lines.append(node.text)
-        elif node.type == "ascii":
+        elif node_type == "ascii":
             lines.append(node.text)
-        elif node.type == "image" or node.type == "figure":
+        elif node_type == "image" or node_type == "figure":
             lines.append(f"[IMAGE] {node.source}")
-            if node.type == "figure" or node.caption:
+            if node_type == "figure" or node.caption:
                 num = _caption_number(caption_state, "figure")
                 lines.append(f"Figure {num}: {node.caption or node.text or node.source}")
-        elif node.type == "table":
+        elif node_type == "table":
             for row in node.rows or []:
                 lines.append(" | ".join(row))
-        elif node.type == "table_caption":
+        elif node_type == "table_caption":
             num = _caption_number(caption_state, "table")
             lines.append(f"Table {num}: {node.text}")
-        elif node.type == "figure_caption":
+        elif node_type == "figure_caption":
             num = _caption_number(caption_state, "figure")
             lines.append(f"Figure {num}: {node.text}")
         lines.append("")
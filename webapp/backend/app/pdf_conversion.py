@@ -12,7 +12,6 @@ from urllib.request import Request, urlopen
 from uuid import uuid4
 
 from fastapi import UploadFile
-from pypdf import PdfReader
 
 from .exporter import (
     FileStore,
@@ -156,9 +155,12 @@ def _format_from_suffix(path: Path) -> str | None:
     return SUPPORTED_PROCESSING_SUFFIXES.get(path.suffix.lower())
 
 
+_OUTPUT_STEM_INVALID_RE = re.compile(r"[^A-Za-z0-9 _-]+")
+
+
 def _safe_output_stem(value: str | None, fallback: str) -> str:
     candidate = Path(value or "").stem.strip()
-    cleaned = re.sub(r"[^A-Za-z0-9 _-]+", "_", candidate).strip().replace(" ", "_")
+    cleaned = _OUTPUT_STEM_INVALID_RE.sub("_", candidate).strip().replace(" ", "_")
     return cleaned[:120] or fallback
 
 
@@ -169,6 +171,8 @@ def _mime_for_format(file_format: str) -> str:
 
 
 def _validate_pdf(path: Path) -> None:
+    from pypdf import PdfReader
+
     try:
         reader = PdfReader(str(path))
         _ = len(reader.pages)
@@ -6,27 +6,32 @@ from pathlib import Path
 from typing import List, Tuple
 from urllib.parse import urlparse
 
-from docx import Document
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 
 
-def remove_docx_metadata(docx_path: Path) -> None:
-    doc = Document(str(docx_path))
+_DOCX_METADATA_FIELDS = (
+    "author",
+    "comments",
+    "category",
+    "title",
+    "subject",
+    "keywords",
+    "last_modified_by",
+    "language",
+)
+
+
+def clear_docx_metadata(doc) -> bool:
     props = doc.core_properties
-    props.author = ""
-    props.comments = ""
-    props.category = ""
-    props.title = ""
-    props.subject = ""
-    props.keywords = ""
-    props.last_modified_by = ""
-    props.language = ""
-    doc.save(str(docx_path))
-
-
-def disable_docx_editing(docx_path: Path) -> None:
-    doc = Document(str(docx_path))
+    if not any(getattr(props, name) for name in _DOCX_METADATA_FIELDS):
+        return False
+    for name in _DOCX_METADATA_FIELDS:
+        setattr(props, name, "")
+    return True
+
+
+def protect_docx_editing(doc) -> None:
     settings = doc.settings.element
     existing = settings.find(qn("w:documentProtection"))
     if existing is not None:
@@ -36,7 +41,6 @@ def disable_docx_editing(docx_path: Path) -> None:
     protection.set(qn("w:edit"), "readOnly")
     protection.set(qn("w:enforcement"), "1")
     settings.append(protection)
-    doc.save(str(docx_path))
 
 
 def secure_pdf(pdf_path: Path, password: str | None, remove_metadata: bool) -> List[str]:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, Mapping
+import threading
+from collections import OrderedDict
+from typing import Dict, Mapping, Tuple
 
 from .models import FormattingOptions, ThemePayload
 
@@ -116,7 +118,28 @@ def _heading_css(theme: ThemePayload) -> str:
     return "".join(chunks)
 
 
+_CSS_CACHE_SIZE = 256
+_CSS_CACHE: OrderedDict[Tuple[str, str], str] = OrderedDict()
+_CSS_CACHE_LOCK = threading.Lock()
+
+
 def css_from_theme(theme: ThemePayload, formatting: FormattingOptions) -> str:
+    # Previews repeat a handful of themes; the JSON dumps are a cheaper key than rebuilding the stylesheet.
+    key = (theme.model_dump_json(), formatting.model_dump_json())
+    with _CSS_CACHE_LOCK:
+        cached = _CSS_CACHE.get(key)
+        if cached is not None:
+            _CSS_CACHE.move_to_end(key)
+            return cached
+    css = _build_css(theme, formatting)
+    with _CSS_CACHE_LOCK:
+        _CSS_CACHE[key] = css
+        while len(_CSS_CACHE) > _CSS_CACHE_SIZE:
+            _CSS_CACHE.popitem(last=False)
+    return css
+
+
+def _build_css(theme: ThemePayload, formatting: FormattingOptions) -> str:
     styles = theme.styles if isinstance(theme.styles, dict) else {}
     body_size = theme.bodyStyle.size or 12
     line_height = formatting.lineSpacing or theme.bodyStyle.lineHeight or 1.5
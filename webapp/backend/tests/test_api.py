@@ -2,13 +2,19 @@ import unittest
 import time
 from unittest.mock import patch
 import io
+import math
+import os
+import subprocess
+import sys
+import tempfile
 import zipfile
+from pathlib import Path
 
 from docx import Document
 from fastapi.testclient import TestClient
 from pypdf import PdfWriter
 
-from app.main import create_app
+from app.main import AppState, _read_json_dict, _write_json, create_app
 from app.templates_repo import SAMPLE_EXAMPLE
 from app.themes import PROFESSIONAL_THEME
 
@@ -168,6 +174,23 @@ class ApiIntegrationTests(unittest.TestCase):
         self.assertIn("structure", body)
         self.assertGreaterEqual(body["structure"]["headingCount"], 1)
 
+    def test_preview_reflects_theme_change_after_identical_request(self) -> None:
+        request = {
+            "content": "H1: Cached preview\nPARAGRAPH: Same content twice.",
+            "security": {"removeMetadata": False, "pageNumberMode": "page_x"},
+        }
+        self.assertEqual(self.client.post("/api/themes/apply", json={"theme_name": "professional"}).status_code, 200)
+        first = self.client.post("/api/preview", json=request)
+        repeat = self.client.post("/api/preview", json=request)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), repeat.json())
+        self.assertNotIn("CORPORATE DOCUMENT", first.json()["previewHtml"])
+
+        self.assertEqual(self.client.post("/api/themes/apply", json={"theme_name": "corporate"}).status_code, 200)
+        after_theme = self.client.post("/api/preview", json=request)
+        self.assertEqual(after_theme.status_code, 200)
+        self.assertIn("CORPORATE DOCUMENT", after_theme.json()["previewHtml"])
+
     def test_generate_and_download_docx(self) -> None:
         response = self.client.post(
             "/api/generate",
@@ -363,6 +386,106 @@ class ApiIntegrationTests(unittest.TestCase):
         self.assertEqual(after_tab.status_code, 200)
         self.assertEqual(after_tab.json()["config"]["spacing"]["tab_width"], 8)
 
+    def test_config_update_survives_values_outside_orjson_range(self) -> None:
+        big = 123456789012345678901234567890
+        update = self.client.post("/api/config/update", json={"path": "custom.big", "value": big})
+        self.assertEqual(update.status_code, 200)
+        after = self.client.get("/api/config")
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()["config"]["custom"]["big"], big)
+
+        rejected = self.client.post(
+            "/api/config/update",
+            content=b'{"path": "custom.bad", "value": "\\ud800"}',
+            headers={"content-type": "application/json"},
+        )
+        self.assertEqual(rejected.status_code, 422)
+        self.assertNotIn("bad", self.client.get("/api/config").json()["config"]["custom"])
+
+        follow_up = self.client.post("/api/config/update", json={"path": "custom.big", "value": 1})
+        self.assertEqual(follow_up.status_code, 200)
+        self.assertEqual(self.client.get("/api/config").json()["config"]["custom"]["big"], 1)
+
+    def test_batch_saves_writes_each_file_once(self) -> None:
+        state = AppState()
+        with patch("app.main._write_json") as write:
+            with state.batch_saves():
+                state.save_config()
+                state.save_themes()
+                with state.batch_saves():
+                    state.save_config()
+                    state.save_themes()
+                self.assertEqual(write.call_count, 0)
+            written = sorted(str(call.args[0]) for call in write.call_args_list)
+            self.assertEqual(written, sorted([str(state.config_path), str(state.themes_path)]))
+
+            write.reset_mock()
+            state.save_config()
+            self.assertEqual(write.call_count, 1)
+
+    def test_write_json_skips_unchanged_payloads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.json"
+            with patch("app.main.os.replace", wraps=os.replace) as replace:
+                _write_json(path, {"a": 1})
+                _write_json(path, {"a": 1})
+                self.assertEqual(replace.call_count, 1)
+                _write_json(path, {"a": 2})
+                self.assertEqual(replace.call_count, 2)
+                path.unlink()
+                _write_json(path, {"a": 2})
+                self.assertEqual(replace.call_count, 3)
+            self.assertEqual(_read_json_dict(path), {"a": 2})
+
+    def test_cached_bodies_follow_theme_and_config_changes(self) -> None:
+        key = "cache_probe_theme"
+        self.client.post("/api/themes/delete", json={"key": key})
+        self.assertNotIn(key, self.client.get("/api/themes").json()["themes"])
+
+        saved = self.client.post("/api/themes/save", json={"key": key, "name": "Cache Probe"})
+        self.assertEqual(saved.status_code, 200)
+        self.assertIn(key, self.client.get("/api/themes").json()["themes"])
+
+        self.assertEqual(self.client.post("/api/themes/apply", json={"theme_name": key}).status_code, 200)
+        self.assertEqual(self.client.get("/api/themes").json()["current_theme"], key)
+        self.assertEqual(self.client.get("/api/config").json()["config"]["app"]["theme"], key)
+
+        update = self.client.post("/api/config/update", json={"path": "app.theme", "value": "professional"})
+        self.assertEqual(update.status_code, 200)
+        self.assertEqual(self.client.get("/api/themes").json()["current_theme"], "professional")
+
+        self.assertEqual(self.client.post("/api/themes/apply", json={"theme_name": key}).status_code, 200)
+        deleted = self.client.post("/api/themes/delete", json={"key": key})
+        self.assertEqual(deleted.status_code, 200)
+        themes = self.client.get("/api/themes").json()
+        self.assertNotIn(key, themes["themes"])
+        self.assertNotEqual(themes["current_theme"], key)
+        self.assertEqual(self.client.get("/api/config").json()["config"]["app"]["theme"], themes["current_theme"])
+
+    def test_importing_main_does_not_build_the_app(self) -> None:
+        probe = (
+            "import logging, app.main as m; "
+            "assert m._APP is None and not logging.getLogger().handlers; "
+            "assert m.app is m.app and m._APP is not None"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_read_json_dict_accepts_nan_and_infinity(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "config.json"
+            path.write_text('{"spacing": {"line_spacing": NaN, "tab_width": Infinity}}', encoding="utf-8")
+            loaded = _read_json_dict(path)
+        self.assertIsNotNone(loaded)
+        self.assertTrue(math.isnan(loaded["spacing"]["line_spacing"]))
+        self.assertEqual(loaded["spacing"]["tab_width"], math.inf)
+
     def test_apply_theme_updates_config(self) -> None:
         applied = self.client.post(
             "/api/themes/apply",
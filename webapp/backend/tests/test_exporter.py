@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.exporter import FileStore
+
+
+class FileStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.base_dir = Path(self._tmp.name)
+
+    def _write_aged(self, name: str, age_seconds: float) -> Path:
+        path = self.base_dir / name
+        path.write_bytes(b"export")
+        stamp = time.time() - age_seconds
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_reserved_file_resolves_once_written(self) -> None:
+        store = FileStore(str(self.base_dir))
+        file_id, path = store.reserve_path("pdf")
+        self.assertEqual(path.parent, self.base_dir)
+        self.assertIsNone(store.resolve_path(file_id))
+
+        path.write_bytes(b"%PDF-1.4")
+        self.assertEqual(store.resolve_path(file_id), path)
+
+    def test_unknown_and_malformed_ids_do_not_resolve(self) -> None:
+        store = FileStore(str(self.base_dir))
+        (self.base_dir / "notes.txt").write_text("not an export", encoding="utf-8")
+        self.assertIsNone(store.resolve_path(uuid4().hex))
+        self.assertIsNone(store.resolve_path("notes"))
+        self.assertIsNone(store.resolve_path("../notes"))
+        self.assertIsNone(store.resolve_path(uuid4().hex.upper()))
+
+    def test_expired_id_does_not_resolve_before_cleanup(self) -> None:
+        store = FileStore(str(self.base_dir), ttl_seconds=60)
+        file_id, path = store.reserve_path("docx")
+        path.write_bytes(b"docx")
+        later = time.time() + 120
+        with patch("app.exporter.time.time", return_value=later):
+            self.assertIsNone(store.resolve_path(file_id))
+        self.assertTrue(path.exists())
+
+    def test_cleanup_removes_only_expired_files(self) -> None:
+        store = FileStore(str(self.base_dir), ttl_seconds=60)
+        old_id, old_path = store.reserve_path("zip")
+        old_path.write_bytes(b"zip")
+        with patch("app.exporter.time.time", return_value=time.time() + 120):
+            new_id, new_path = store.reserve_path("md")
+            new_path.write_bytes(b"# md")
+            store.cleanup()
+            self.assertFalse(old_path.exists())
+            self.assertIsNone(store.resolve_path(old_id))
+            self.assertEqual(store.resolve_path(new_id), new_path)
+
+    def test_existing_files_are_reconciled_at_startup(self) -> None:
+        fresh_id = uuid4().hex
+        fresh_path = self._write_aged(f"{fresh_id}.html", age_seconds=10)
+        stale_id = uuid4().hex
+        stale_path = self._write_aged(f"{stale_id}.txt", age_seconds=600)
+
+        store = FileStore(str(self.base_dir), ttl_seconds=60)
+        self.assertFalse(stale_path.exists())
+        self.assertIsNone(store.resolve_path(stale_id))
+        self.assertEqual(store.resolve_path(fresh_id), fresh_path)
+
+        with patch("app.exporter.time.time", return_value=time.time() + 120):
+            store.cleanup()
+        self.assertFalse(fresh_path.exists())
+
+    def test_file_written_by_another_store_resolves(self) -> None:
+        store = FileStore(str(self.base_dir), ttl_seconds=60)
+        file_id, path = FileStore(str(self.base_dir), ttl_seconds=60).reserve_path("pdf")
+        path.write_bytes(b"%PDF-1.4")
+        self.assertEqual(store.resolve_path(file_id), path)
+
+        self._write_aged(path.name, age_seconds=600)
+        self.assertIsNone(store.resolve_path(file_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
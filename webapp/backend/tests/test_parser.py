@@ -1,5 +1,6 @@
 import unittest
 
+from app.markers import MARKER_NAMES, MARKER_REGEX, split_marker_line
 from app.parser import parse_notesforge, to_markdown
 from app.templates_repo import SAMPLE_EXAMPLE
 
@@ -301,6 +302,25 @@ class ParserTests(unittest.TestCase):
         self.assertIn("1. Parent", md)
         self.assertIn("1.1. Child", md)
 
+    def test_split_marker_line_agrees_with_marker_regex(self) -> None:
+        lines = [
+            "  h2 :  spaced",
+            "SUB-SUBHEADING:deep",
+            "TABLE:| a | b |",
+            "CODE : x = {'a': 1}",
+            "\u017fubheading: folded",
+            "H1 H2: not a marker",
+            "plain text: with a colon",
+            ": empty name",
+            "H1",
+        ]
+        for name in MARKER_NAMES:
+            lines.extend([f"{name}: payload", f"\t{name.lower()} :", f" {name.title()}:x"])
+        for line in lines:
+            match = MARKER_REGEX.match(line)
+            expected = (match.group(1).upper(), match.group(2)) if match else None
+            self.assertEqual(split_marker_line(line), expected, line)
+
 
 if __name__ == "__main__":
     unittest.main()